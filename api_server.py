@@ -1,13 +1,22 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request
+from flask_sock import Sock
 import uuid
 import docker
 import threading
 import time
 import logging
 import os
-import json
+import sys
+import orjson
 import argparse
 import random
+import heapq
+import queue
+import socket
+import struct
+import math
+from collections import deque
+from sortedcontainers import SortedKeyList
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -16,9 +25,55 @@ logger = logging.getLogger(__name__)
 # Parse command line arguments
 parser = argparse.ArgumentParser(description='Kubernetes-like Cluster Simulation API Server')
 parser.add_argument('--port', type=int, default=5001, help='Port to run the server on (default: 5001)')
-args = parser.parse_args()
+parser.add_argument('--udp-port', type=int, default=5002,
+                    help='UDP port for node heartbeat datagrams, 0 to disable (default: 5002)')
+# parse_known_args so the module can also be imported by gunicorn (see wsgi.py)
+args, _ = parser.parse_known_args()
+
+# Container settings shared by every node launch, computed once at startup
+_API_URL = f"http://host.docker.internal:{args.port}"
+# HEARTBEAT_UDP_PORT is added by HeartbeatListener once its port is bound
+_NODE_ENV = {"API_SERVER_URL": _API_URL}
+
+# Heartbeat datagram layout, shared with node.py: node_id, available_cores, pod_count, status (1 = healthy)
+_HEARTBEAT_STRUCT = struct.Struct("!16sHHB")
+# Reply to a heartbeat datagram from a known node; nodes that get none resend over HTTP
+_HEARTBEAT_ACK = b"\x01"
+_APP_VOLUME = {os.path.abspath('.'): {'bind': '/app', 'mode': 'rw'}}
 
 app = Flask(__name__)
+sock = Sock(app)
+
+def fastjson(obj, status=200):
+    """Build a JSON response encoded with orjson instead of the stdlib json module"""
+    # Node pod sets are not natively serializable, so emit them as lists
+    return app.response_class(orjson.dumps(obj, default=list), status=status, mimetype='application/json')
+
+def new_id():
+    """Generate a short 12-hex-digit node/pod ID, interned since it is hashed and compared on every scheduling decision"""
+    return sys.intern(uuid.uuid4().hex[:12])
+
+# Serialized response bodies keyed by endpoint: {name: (etag, body)}
+_response_cache = {}
+# Distinguishes ETags issued by this process from those of a previous run
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+def cached_json(name, version, build):
+    """Build a JSON response that is only re-encoded when version changes.
+    
+    Clients that send the current ETag in If-None-Match get an empty 304.
+    """
+    etag = f"{_BOOT_ID}-{version}"
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        cached = _response_cache.get(name)
+        if cached is None or cached[0] != etag:
+            cached = (etag, orjson.dumps(build(), default=list))
+            _response_cache[name] = cached
+        response = app.response_class(cached[1], status=200, mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
 # Initialize Docker client - make it global
 docker_client = None
@@ -62,275 +117,554 @@ except docker.errors.DockerException as e:
 class NodeManager:
     def __init__(self):
         self.nodes = {}  # Dictionary to store node information {node_id: {cpu_cores, status, pods, container_id}}
-        self.node_last_heartbeat = {}  # Track last heartbeat time for each node
-        # Store reference to global docker_client
-        global docker_client
-        self.docker_client = docker_client
-        # Track the last node used for round-robin scheduling
-        self.last_used_node_index = -1
+        # Guards all node, pod and heartbeat state; shared with the PodScheduler
+        self.lock = threading.RLock()
+        # Signalled on every version bump so dashboards can be pushed updates instead of polling
+        self._changed = threading.Condition(self.lock)
+        # Min-heap of (heartbeat_time, node_id, epoch); entries whose epoch is no longer
+        # the node's latest are stale and get dropped when they reach the top
+        self._heartbeat_heap = []
+        self._heartbeat_epoch = {}
+        # Nodes running in simulation mode, all served by one heartbeat thread
+        self._sim_nodes = set()
+        self._sim_thread = None
+        # Healthy node IDs ordered by available cores, for best-fit/worst-fit lookups
+        self._by_available = SortedKeyList(key=lambda node_id: self.nodes[node_id]['available_cores'])
+        # Running totals so get_node_stats does not have to scan every node
+        self._healthy_nodes = 0
+        self._pending_nodes = 0
+        self._total_cores = 0
+        self._available_cores = 0
+        # Bumped on every change to self.nodes, used to cache the /nodes response
+        self._version = 0
+        # Healthy node IDs in round-robin order; the head is the next node to try
+        self._rr_queue = deque()
+        # Container launches run on a small worker pool, off the request path
+        self._launch_queue = queue.Queue()
+        for _ in range(4):
+            threading.Thread(target=self._launch_nodes, daemon=True).start()
 
     def add_node(self, cpu_cores):
-        """Add a new node to the cluster with specified CPU cores"""
-        node_id = str(uuid.uuid4())
+        """Add a new node to the cluster with specified CPU cores.
+        
+        Returns the node ID and its status: 'pending' while its Docker container
+        is being launched in the background, or 'healthy' in simulation mode.
+        """
+        node_id = new_id()
     
-        # Check if Docker is available - use self.docker_client instead of docker_client
-        if self.docker_client is not None:
-            # Launch a Docker container to simulate the node
-            try:
-                container = self.docker_client.containers.run(
-                    "python:3.9-slim",
-                    f"python /app/node.py {node_id} {cpu_cores}",
-                    detach=True,
-                    volumes={os.path.abspath('.'): {'bind': '/app', 'mode': 'rw'}},
-                    network="host",
-                    environment={
-                        "API_SERVER_URL": f"http://host.docker.internal:{args.port}"
-                    },
-                    name=f"node-{node_id}"
-                )
-                
-                # Register the node
-                self.nodes[node_id] = {
-                    'cpu_cores': cpu_cores,
-                    'available_cores': cpu_cores,
-                    'status': 'healthy',
-                    'pods': [],
-                    'container_id': container.id
-                }
-                
-                self.node_last_heartbeat[node_id] = time.time()
-                
-                logger.info(f"Node {node_id} added with {cpu_cores} CPU cores")
-                return node_id, True
-                
-            except Exception as e:
-                logger.error(f"Failed to add node with Docker: {str(e)}")
-                # Fall back to simulation mode
-                self.docker_client = None
+        # Check if Docker is available - the module-level client is shared by all requests
+        if docker_client is not None:
+            # Reserve the node and let a launch worker start its container
+            self._register_node(node_id, cpu_cores, None)
+            self._launch_queue.put((node_id, cpu_cores))
+            
+            logger.info(f"Node {node_id} queued for launch with {cpu_cores} CPU cores")
+            return node_id, 'pending'
         
         # If Docker is not available, simulate the node
-        if self.docker_client is None:
+        with self.lock:
             # Register the node without actually creating a Docker container
+            self._register_node(node_id, cpu_cores, 'simulation-mode')
+            self._activate_node(node_id)
+            self._start_simulating(node_id)
+        
+        logger.info(f"Node {node_id} added in simulation mode with {cpu_cores} CPU cores")
+        return node_id, 'healthy'
+
+    def _launch_nodes(self):
+        """Launch queued node containers and mark the nodes healthy once they are running"""
+        global docker_client
+        while True:
+            node_id, cpu_cores = self._launch_queue.get()
+            container = None
+            client = docker_client
+            
+            if client is not None:
+                # Launch a Docker container to simulate the node
+                try:
+                    container = client.containers.run(
+                        "python:3.9-slim",
+                        f"python /app/node.py {node_id} {cpu_cores}",
+                        detach=True,
+                        volumes=_APP_VOLUME,
+                        network="host",
+                        environment=_NODE_ENV,
+                        name=f"node-{node_id}"
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to add node with Docker: {str(e)}")
+                    # Fall back to simulation mode
+                    docker_client = None
+            
+            with self.lock:
+                # A node terminated or failed while its container was starting must stay down
+                abandoned = self.nodes[node_id]['status'] != 'pending'
+                if abandoned:
+                    logger.info(f"Node {node_id} left the pending state during launch, not activating it")
+                elif container is None:
+                    self.nodes[node_id]['container_id'] = 'simulation-mode'
+                    self._start_simulating(node_id)
+                    self._activate_node(node_id)
+                    logger.info(f"Node {node_id} added in simulation mode with {cpu_cores} CPU cores")
+                else:
+                    self.nodes[node_id]['container_id'] = container.id
+                    self._activate_node(node_id)
+                    logger.info(f"Node {node_id} added with {cpu_cores} CPU cores")
+            
+            if abandoned and container is not None:
+                try:
+                    container.remove(force=True)
+                except Exception as e:
+                    logger.error(f"Failed to remove container of node {node_id}: {str(e)}")
+            
+            self._launch_queue.task_done()
+
+    def register_external_node(self, node_id, cpu_cores):
+        """Add a node whose process was started outside the server and registered itself"""
+        node_id = sys.intern(node_id)
+        with self.lock:
+            node = self.nodes.get(node_id)
+            if node is not None and node['status'] != 'unhealthy':
+                return False
+            if node is None:
+                self._register_node(node_id, cpu_cores, 'external')
+            self._activate_node(node_id)
+            logger.info(f"Node {node_id} registered itself with {cpu_cores} CPU cores")
+            return True
+    
+    def _register_node(self, node_id, cpu_cores, container_id):
+        """Store a new node in the pending state"""
+        with self.lock:
             self.nodes[node_id] = {
                 'cpu_cores': cpu_cores,
                 'available_cores': cpu_cores,
-                'status': 'healthy',
-                'pods': [],
-                'container_id': 'simulation-mode'
+                'status': 'pending',
+                'pods': set(),
+                'container_id': container_id
             }
-            
-            self.node_last_heartbeat[node_id] = time.time()
-            
-            # Simulate heartbeats for this node
-            threading.Thread(
-                target=self._simulate_heartbeats, 
-                args=(node_id,),
-                daemon=True
-            ).start()
-            
-            logger.info(f"Node {node_id} added in simulation mode with {cpu_cores} CPU cores")
-            return node_id, True
+            self._pending_nodes += 1
+            self._total_cores += cpu_cores
+            self._available_cores += cpu_cores
+            self._bump_version()
+
+    def _activate_node(self, node_id):
+        """Record a node's first heartbeat and make it available for scheduling"""
+        with self.lock:
+            self._record_heartbeat(node_id)
+            self._set_status(node_id, 'healthy')
 
-    def _simulate_heartbeats(self, node_id):
-        """Simulate heartbeats for a node in simulation mode"""
-        self.nodes[node_id]['simulate_heartbeats'] = True
-        while node_id in self.nodes and self.nodes[node_id].get('simulate_heartbeats', False):
-            self.update_node_heartbeat(node_id)
-            time.sleep(5)  # Send simulated heartbeat every 5 seconds
+    def _start_simulating(self, node_id):
+        """Send heartbeats for a node that has no real container behind it"""
+        with self.lock:
+            self._sim_nodes.add(node_id)
+            if self._sim_thread is None:
+                self._sim_thread = threading.Thread(target=self._simulate_heartbeats, daemon=True)
+                self._sim_thread.start()
 
-    def get_nodes(self):
-        """Get all registered nodes and their status"""
-        return self.nodes
+    def _simulate_heartbeats(self):
+        """Simulate heartbeats for all nodes in simulation mode"""
+        while True:
+            with self.lock:
+                for node_id in self._sim_nodes:
+                    self.update_node_heartbeat(node_id)
+            time.sleep(5)  # Send simulated heartbeats every 5 seconds
+
+    def get_version(self):
+        """Get the current node version, which changes whenever any node changes"""
+        return self._version
+    
+    def _bump_version(self):
+        """Record a change to the cluster state and wake anyone waiting for one; caller holds the lock"""
+        self._version += 1
+        self._changed.notify_all()
+    
+    def wait_for_change(self, version, timeout):
+        """Block until the version differs from the given one or the timeout passes, returning the current version"""
+        with self.lock:
+            self._changed.wait_for(lambda: self._version != version, timeout)
+            return self._version
+
+    def _set_status(self, node_id, status):
+        """Change a node's status, keeping the healthy node index in sync"""
+        node = self.nodes[node_id]
+        if node['status'] == status:
+            return
+        if node['status'] == 'healthy':
+            self._by_available.discard(node_id)
+            self._rr_queue.remove(node_id)
+            self._healthy_nodes -= 1
+        elif node['status'] == 'pending':
+            self._pending_nodes -= 1
+        node['status'] = status
+        self._bump_version()
+        if status == 'healthy':
+            self._by_available.add(node_id)
+            self._rr_queue.append(node_id)
+            self._healthy_nodes += 1
+    
+    def _record_heartbeat(self, node_id):
+        """Queue a heartbeat for the health monitor, superseding the node's earlier ones"""
+        heartbeat_time = time.monotonic()
+        epoch = self._heartbeat_epoch.get(node_id, 0) + 1
+        self._heartbeat_epoch[node_id] = epoch
+        heapq.heappush(self._heartbeat_heap, (heartbeat_time, node_id, epoch))
+    
+    def pop_expired_heartbeats(self, cutoff):
+        """Pop nodes whose latest heartbeat is older than cutoff and that are not already unhealthy"""
+        expired = []
+        with self.lock:
+            heap = self._heartbeat_heap
+            while heap and heap[0][0] < cutoff:
+                _, node_id, epoch = heapq.heappop(heap)
+                if epoch == self._heartbeat_epoch.get(node_id) and self.nodes[node_id]['status'] != 'unhealthy':
+                    expired.append(node_id)
+        return expired
+    
+    def oldest_heartbeat_time(self):
+        """Get the oldest live heartbeat time, discarding stale heap entries"""
+        with self.lock:
+            heap = self._heartbeat_heap
+            while heap and heap[0][2] != self._heartbeat_epoch.get(heap[0][1]):
+                heapq.heappop(heap)
+            return heap[0][0] if heap else None
     
     def update_node_heartbeat(self, node_id):
         """Update the last heartbeat time for a node"""
-        if node_id in self.nodes:
-            self.node_last_heartbeat[node_id] = time.time()
-            self.nodes[node_id]['status'] = 'healthy'
-            return True
-        return False
+        with self.lock:
+            node = self.nodes.get(node_id)
+            if node is not None:
+                self._record_heartbeat(node_id)
+                # A pending node is activated by its launch worker, which would
+                # otherwise take the early promotion for an abandoned launch
+                if node['status'] != 'pending':
+                    self._set_status(node_id, 'healthy')
+                return True
+            return False
     
     def mark_node_unhealthy(self, node_id):
         """Mark a node as unhealthy"""
-        if node_id in self.nodes:
-            self.nodes[node_id]['status'] = 'unhealthy'
-            # Stop simulating heartbeats for this node
-            self.nodes[node_id]['simulate_heartbeats'] = False
-            return True
-        return False
+        with self.lock:
+            if node_id in self.nodes:
+                self._set_status(node_id, 'unhealthy')
+                # Stop simulating heartbeats for this node
+                self._sim_nodes.discard(node_id)
+                return True
+            return False
     
     def terminate_node(self, node_id):
         """Handle node termination"""
-        if node_id in self.nodes:
-            self.nodes[node_id]['status'] = 'unhealthy'
-            # Stop simulating heartbeats for this node
-            self.nodes[node_id]['simulate_heartbeats'] = False
-            return True
-        return False
+        with self.lock:
+            if node_id in self.nodes:
+                self._set_status(node_id, 'unhealthy')
+                # Stop simulating heartbeats for this node
+                self._sim_nodes.discard(node_id)
+                return True
+            return False
+    
+    def get_node_status(self, node_id):
+        """Get the status of a node, or None if it does not exist"""
+        with self.lock:
+            node = self.nodes.get(node_id)
+            return node['status'] if node else None
+    
+    def has_healthy_nodes(self):
+        """Check whether any node is currently healthy"""
+        return len(self._by_available) > 0
+    
+    def get_best_fit_node(self, cpu_requirement):
+        """Get the healthy node with the fewest available cores that can still fit the requirement"""
+        return next(self._by_available.irange_key(min_key=cpu_requirement), None)
     
-    def get_healthy_nodes(self):
-        """Get all healthy nodes"""
-        return {node_id: node_info for node_id, node_info in self.nodes.items() 
-                if node_info['status'] == 'healthy'}
+    def get_worst_fit_node(self, cpu_requirement):
+        """Get the healthy node with the most available cores if it can fit the requirement"""
+        if self._by_available:
+            node_id = self._by_available[-1]
+            if self.nodes[node_id]['available_cores'] >= cpu_requirement:
+                return node_id
+        return None
+    
+    def get_round_robin_node(self, cpu_requirement):
+        """Get the next healthy node in round-robin order that can fit the requirement"""
+        for _ in range(len(self._rr_queue)):
+            node_id = self._rr_queue[0]
+            # Rotate past this node whether or not it fits so the next request starts after it
+            self._rr_queue.rotate(-1)
+            if self.nodes[node_id]['available_cores'] >= cpu_requirement:
+                return node_id
+        return None
     
     def add_pod_to_node(self, node_id, pod_id, cpu_requirement):
         """Add a pod to a node"""
-        if node_id in self.nodes and self.nodes[node_id]['available_cores'] >= cpu_requirement:
-            self.nodes[node_id]['pods'].append(pod_id)
-            self.nodes[node_id]['available_cores'] -= cpu_requirement
-            return True
-        return False
+        with self.lock:
+            # Re-check health under the lock: the node may have failed since it was selected
+            node = self.nodes.get(node_id)
+            if (node is not None and node['status'] == 'healthy'
+                    and node['available_cores'] >= cpu_requirement):
+                # Re-insert into the index since its sort key is about to change
+                self._by_available.remove(node_id)
+                node['pods'].add(pod_id)
+                node['available_cores'] -= cpu_requirement
+                self._by_available.add(node_id)
+                self._available_cores -= cpu_requirement
+                self._bump_version()
+                return True
+            return False
+    
+    def remove_pod_from_node(self, node_id, pod_id, cpu_requirement):
+        """Drop a pod from a node's pod set, e.g. after it was moved to another node, and return its cores"""
+        with self.lock:
+            node = self.nodes.get(node_id)
+            if node is not None and pod_id in node['pods']:
+                # Only healthy nodes are indexed; re-insert since the sort key is about to change
+                indexed = node['status'] == 'healthy'
+                if indexed:
+                    self._by_available.remove(node_id)
+                node['pods'].discard(pod_id)
+                node['available_cores'] += cpu_requirement
+                if indexed:
+                    self._by_available.add(node_id)
+                self._available_cores += cpu_requirement
+                self._bump_version()
     
     def get_pods_on_node(self, node_id):
         """Get all pods on a node"""
-        if node_id in self.nodes:
-            return self.nodes[node_id]['pods']
-        return []
+        with self.lock:
+            node = self.nodes.get(node_id)
+            if node is not None:
+                return list(node['pods'])
+            return []
     
     def get_node_stats(self):
-        """Get statistics about nodes in the cluster"""
-        total_nodes = len(self.nodes)
-        healthy_nodes = sum(1 for node_info in self.nodes.values() if node_info['status'] == 'healthy')
-        unhealthy_nodes = total_nodes - healthy_nodes
+        """Get statistics about nodes in the cluster from the running totals"""
+        with self.lock:
+            total_nodes = len(self.nodes)
+            return {
+                'total_nodes': total_nodes,
+                'healthy_nodes': self._healthy_nodes,
+                'pending_nodes': self._pending_nodes,
+                'unhealthy_nodes': total_nodes - self._healthy_nodes - self._pending_nodes,
+                'total_cores': self._total_cores,
+                'available_cores': self._available_cores,
+                'used_cores': self._total_cores - self._available_cores
+            }
+    
+    def scan_node_stats(self):
+        """Recompute node statistics by scanning every node (used to validate the running totals)"""
+        with self.lock:
+            total_nodes = len(self.nodes)
+            healthy_nodes = sum(1 for node_info in self.nodes.values() if node_info['status'] == 'healthy')
+            pending_nodes = sum(1 for node_info in self.nodes.values() if node_info['status'] == 'pending')
+            unhealthy_nodes = total_nodes - healthy_nodes - pending_nodes
         
-        total_cores = sum(node_info['cpu_cores'] for node_info in self.nodes.values())
-        available_cores = sum(node_info['available_cores'] for node_info in self.nodes.values())
-        used_cores = total_cores - available_cores
+            total_cores = sum(node_info['cpu_cores'] for node_info in self.nodes.values())
+            available_cores = sum(node_info['available_cores'] for node_info in self.nodes.values())
+            used_cores = total_cores - available_cores
         
-        return {
-            'total_nodes': total_nodes,
-            'healthy_nodes': healthy_nodes,
-            'unhealthy_nodes': unhealthy_nodes,
-            'total_cores': total_cores,
-            'available_cores': available_cores,
-            'used_cores': used_cores
-        }
+            return {
+                'total_nodes': total_nodes,
+                'healthy_nodes': healthy_nodes,
+                'pending_nodes': pending_nodes,
+                'unhealthy_nodes': unhealthy_nodes,
+                'total_cores': total_cores,
+                'available_cores': available_cores,
+                'used_cores': used_cores
+            }
 
 class PodScheduler:
     def __init__(self, node_manager):
         self.node_manager = node_manager
+        # Share the node manager's lock so selection and placement are atomic
+        self.lock = node_manager.lock
         self.pods = {}  # Dictionary to store pod information {pod_id: {cpu_requirement, node_id}}
-        self.last_node_index = -1  # For round-robin scheduling
+        # Running totals so get_pod_stats does not have to scan every pod
+        self._total_cpu_usage = 0
+        self._pods_per_node = {}
+        # Node selection function for each scheduling algorithm
+        self._dispatch = {
+            'first-fit': self._first_fit,
+            'best-fit': self._best_fit,
+            'worst-fit': self._worst_fit,
+            'round-robin': self._round_robin,
+            'random-fit': self._random_fit
+        }
+        self.algorithms = tuple(self._dispatch)
     
     def schedule_pod(self, cpu_requirement, algorithm="first-fit"):
-        """Schedule a pod on an available node based on the specified algorithm"""
-        pod_id = str(uuid.uuid4())
-        healthy_nodes = self.node_manager.get_healthy_nodes()
+        """Schedule a pod on an available node based on the specified algorithm.
         
-        if not healthy_nodes:
-            logger.warning("No healthy nodes available for scheduling")
-            return None, "No healthy nodes available"
+        Raises KeyError if the algorithm is not one of self.algorithms.
+        """
+        select_node = self._dispatch[algorithm]
+        pod_id = new_id()
         
-        # Filter nodes with enough available cores
-        eligible_nodes = {node_id: node_info for node_id, node_info in healthy_nodes.items() 
-                         if node_info['available_cores'] >= cpu_requirement}
+        with self.lock:
+            if not self.node_manager.has_healthy_nodes():
+                logger.warning("No healthy nodes available for scheduling")
+                return None, "No healthy nodes available"
         
-        if not eligible_nodes:
-            logger.warning(f"No nodes with enough resources ({cpu_requirement} cores) available")
-            return None, "Insufficient resources"
+            # Apply scheduling algorithm
+            selected_node_id = select_node(cpu_requirement)
         
-        selected_node_id = None
+            if selected_node_id is None:
+                logger.warning(f"No nodes with enough resources ({cpu_requirement} cores) available")
+                return None, "Insufficient resources"
         
-        # Apply scheduling algorithm
-        if algorithm == "first-fit":
-            # First-fit: Select the first node with enough resources
-            selected_node_id = next(iter(eligible_nodes))
-            
-        elif algorithm == "best-fit":
-            # Best-fit: Select the node with the least available resources that can still fit the pod
-            selected_node_id = min(eligible_nodes, key=lambda node_id: eligible_nodes[node_id]['available_cores'])
-            
-        elif algorithm == "worst-fit":
-            # Worst-fit: Select the node with the most available resources
-            selected_node_id = max(eligible_nodes, key=lambda node_id: eligible_nodes[node_id]['available_cores'])
+            # Add pod to the selected node
+            if self.node_manager.add_pod_to_node(selected_node_id, pod_id, cpu_requirement):
+                # Store pod information
+                self.pods[pod_id] = {
+                    'cpu_requirement': cpu_requirement,
+                    'node_id': selected_node_id,
+                    'algorithm': algorithm  # Store the algorithm used
+                }
+                self._total_cpu_usage += cpu_requirement
+                self._pods_per_node[selected_node_id] = self._pods_per_node.get(selected_node_id, 0) + 1
             
-        elif algorithm == "round-robin":
-            # Round-robin: Distribute pods evenly across nodes
-            eligible_node_ids = list(eligible_nodes.keys())
-            if eligible_node_ids:
-                # Sort nodes by pod count for more even distribution
-                sorted_nodes = sorted(eligible_node_ids, 
-                                     key=lambda node_id: len(eligible_nodes[node_id]['pods']))
-                selected_node_id = sorted_nodes[0]
-                
-        elif algorithm == "random-fit":
-            # Random-fit: Randomly select a node from eligible nodes
-            eligible_node_ids = list(eligible_nodes.keys())
-            if eligible_node_ids:
-                selected_node_id = random.choice(eligible_node_ids)
+                logger.info(f"Pod {pod_id} scheduled on node {selected_node_id} with {cpu_requirement} CPU cores using {algorithm}")
+                return pod_id, selected_node_id
         
-        # Add pod to the selected node
-        if selected_node_id and self.node_manager.add_pod_to_node(selected_node_id, pod_id, cpu_requirement):
-            # Store pod information
-            self.pods[pod_id] = {
-                'cpu_requirement': cpu_requirement,
-                'node_id': selected_node_id,
-                'algorithm': algorithm  # Store the algorithm used
-            }
+            return None, "Failed to schedule pod"
+    
+    def schedule_pods_bulk(self, cpu_requirements):
+        """Schedule a batch of pods using first-fit decreasing.
+        
+        Pods are placed largest first so the batch packs onto fewer nodes.
+        Returns a (pod_id, node_id or error) pair for each requirement, in input order.
+        """
+        results = [None] * len(cpu_requirements)
+        order = sorted(range(len(cpu_requirements)), key=lambda i: cpu_requirements[i], reverse=True)
+        
+        # Hold the lock for the whole batch so the packing decision is consistent
+        with self.lock:
+            for i in order:
+                results[i] = self.schedule_pod(cpu_requirements[i], "first-fit")
             
-            logger.info(f"Pod {pod_id} scheduled on node {selected_node_id} with {cpu_requirement} CPU cores using {algorithm}")
-            return pod_id, selected_node_id
+            # Compare against the lower bound on nodes needed to hold the batch
+            max_cores = max((node_info['cpu_cores'] for node_info in self.node_manager.nodes.values()
+                             if node_info['status'] == 'healthy'), default=0)
         
-        return None, "Failed to schedule pod"
+        scheduled = [node_id for pod_id, node_id in results if pod_id]
+        if max_cores:
+            lower_bound = math.ceil(sum(cpu_requirements) / max_cores)
+            logger.info(f"Bulk scheduled {len(scheduled)}/{len(results)} pods on {len(set(scheduled))} nodes "
+                        f"(lower bound {lower_bound})")
+        return results
+    
+    def _first_fit(self, cpu_requirement):
+        """First-fit: Select the first node with enough resources, stopping at the first match"""
+        return next((node_id for node_id, node_info in self.node_manager.nodes.items()
+                     if node_info['status'] == 'healthy'
+                     and node_info['available_cores'] >= cpu_requirement), None)
+    
+    def _best_fit(self, cpu_requirement):
+        """Best-fit: Select the node with the least available resources that can still fit the pod"""
+        return self.node_manager.get_best_fit_node(cpu_requirement)
+    
+    def _worst_fit(self, cpu_requirement):
+        """Worst-fit: Select the node with the most available resources"""
+        return self.node_manager.get_worst_fit_node(cpu_requirement)
+    
+    def _round_robin(self, cpu_requirement):
+        """Round-robin: Distribute pods evenly across nodes"""
+        return self.node_manager.get_round_robin_node(cpu_requirement)
+    
+    def _random_fit(self, cpu_requirement):
+        """Random-fit: Randomly select a node from eligible nodes"""
+        eligible_node_ids = [node_id for node_id, node_info in self.node_manager.nodes.items()
+                             if node_info['status'] == 'healthy'
+                             and node_info['available_cores'] >= cpu_requirement]
+        return random.choice(eligible_node_ids) if eligible_node_ids else None
     
     def get_pod_info(self, pod_id):
         """Get information about a pod"""
-        return self.pods.get(pod_id)
+        with self.lock:
+            return self.pods.get(pod_id)
     
     def get_all_pods(self):
-        """Get all pods in the cluster"""
-        return self.pods
+        """Get a snapshot of all pods in the cluster"""
+        with self.lock:
+            return {pod_id: dict(pod_info) for pod_id, pod_info in self.pods.items()}
     
     def reschedule_pods_from_node(self, failed_node_id):
         """Reschedule pods from a failed node to healthy nodes"""
-        if failed_node_id not in self.node_manager.nodes:
-            return False
+        with self.lock:
+            if failed_node_id not in self.node_manager.nodes:
+                return False
         
-        # Get pods on the failed node
-        pods_to_reschedule = [(pod_id, pod_info) for pod_id, pod_info in self.pods.items() 
-                             if pod_info['node_id'] == failed_node_id]
+            # Get pods on the failed node from its own pod set instead of scanning every pod
+            pods_to_reschedule = [(pod_id, self.pods[pod_id])
+                                  for pod_id in self.node_manager.nodes[failed_node_id]['pods']
+                                  if pod_id in self.pods and self.pods[pod_id]['node_id'] == failed_node_id]
         
-        if not pods_to_reschedule:
-            logger.info(f"No pods to reschedule from node {failed_node_id}")
-            return True
+            if not pods_to_reschedule:
+                logger.info(f"No pods to reschedule from node {failed_node_id}")
+                return True
+        
+            logger.info(f"Rescheduling {len(pods_to_reschedule)} pods from failed node {failed_node_id}")
         
-        logger.info(f"Rescheduling {len(pods_to_reschedule)} pods from failed node {failed_node_id}")
+            if not self.node_manager.has_healthy_nodes():
+                logger.warning(f"No healthy nodes available to reschedule pods from failed node {failed_node_id}")
+                return True
         
-        # Reschedule each pod using their original scheduling algorithm
-        for pod_id, pod_info in pods_to_reschedule:
-            cpu_requirement = pod_info['cpu_requirement']
-            algorithm = pod_info.get('algorithm', 'first-fit')  # Default to first-fit if not specified
+            # Place the largest pods first (first-fit decreasing), which packs the
+            # remaining capacity more tightly than placing them in arrival order
+            pods_to_reschedule.sort(key=lambda item: item[1]['cpu_requirement'], reverse=True)
+        
+            # Reschedule each pod using their original scheduling algorithm
+            for pod_id, pod_info in pods_to_reschedule:
+                cpu_requirement = pod_info['cpu_requirement']
+                algorithm = pod_info.get('algorithm', 'first-fit')  # Default to first-fit if not specified
             
-            # Try to schedule the pod on a healthy node
-            new_pod_id, new_node_id = self.schedule_pod(cpu_requirement, algorithm)
+                # Try to schedule the pod on a healthy node
+                new_pod_id, new_node_id = self.schedule_pod(cpu_requirement, algorithm)
             
-            if new_pod_id:
-                logger.info(f"Pod {pod_id} from failed node {failed_node_id} rescheduled as {new_pod_id} on node {new_node_id}")
-                # Remove the old pod
-                del self.pods[pod_id]
-            else:
-                logger.warning(f"Failed to reschedule pod {pod_id} from failed node {failed_node_id}")
+                if new_pod_id:
+                    logger.info(f"Pod {pod_id} from failed node {failed_node_id} rescheduled as {new_pod_id} on node {new_node_id}")
+                    # Remove the old pod
+                    self.node_manager.remove_pod_from_node(failed_node_id, pod_id, cpu_requirement)
+                    self._remove_pod(pod_id)
+                else:
+                    logger.warning(f"Failed to reschedule pod {pod_id} from failed node {failed_node_id}")
         
-        return True
+            return True
+    
+    def _remove_pod(self, pod_id):
+        """Delete a pod record and update the running totals"""
+        pod_info = self.pods.pop(pod_id)
+        node_id = pod_info['node_id']
+        self._total_cpu_usage -= pod_info['cpu_requirement']
+        self._pods_per_node[node_id] -= 1
+        if not self._pods_per_node[node_id]:
+            del self._pods_per_node[node_id]
     
     def get_pod_stats(self):
-        """Get statistics about pods in the cluster"""
-        total_pods = len(self.pods)
-        total_cpu_usage = sum(pod_info['cpu_requirement'] for pod_info in self.pods.values())
+        """Get statistics about pods in the cluster from the running totals"""
+        with self.lock:
+            return {
+                'total_pods': len(self.pods),
+                'total_cpu_usage': self._total_cpu_usage,
+                'pods_per_node': dict(self._pods_per_node)
+            }
+    
+    def scan_pod_stats(self):
+        """Recompute pod statistics by scanning every pod (used to validate the running totals)"""
+        with self.lock:
+            total_pods = len(self.pods)
+            total_cpu_usage = sum(pod_info['cpu_requirement'] for pod_info in self.pods.values())
         
-        # Count pods per node
-        pods_per_node = {}
-        for pod_id, pod_info in self.pods.items():
-            node_id = pod_info['node_id']
-            if node_id not in pods_per_node:
-                pods_per_node[node_id] = 0
-            pods_per_node[node_id] += 1
+            # Count pods per node
+            pods_per_node = {}
+            for pod_id, pod_info in self.pods.items():
+                node_id = pod_info['node_id']
+                if node_id not in pods_per_node:
+                    pods_per_node[node_id] = 0
+                pods_per_node[node_id] += 1
         
-        return {
-            'total_pods': total_pods,
-            'total_cpu_usage': total_cpu_usage,
-            'pods_per_node': pods_per_node
-        }
+            return {
+                'total_pods': total_pods,
+                'total_cpu_usage': total_cpu_usage,
+                'pods_per_node': pods_per_node
+            }
 
 class HealthMonitor:
     def __init__(self, node_manager, pod_scheduler):
@@ -338,14 +672,15 @@ class HealthMonitor:
         self.pod_scheduler = pod_scheduler
         self.heartbeat_timeout = 15  # seconds
         self.monitoring_thread = None
-        self.running = False
+        # Set to stop the monitor; waiting on it keeps the loop interruptible
+        self._stop_event = threading.Event()
         
     def start_monitoring(self):
         """Start the health monitoring thread"""
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             return
         
-        self.running = True
+        self._stop_event.clear()
         self.monitoring_thread = threading.Thread(target=self._monitor_nodes)
         self.monitoring_thread.daemon = True
         self.monitoring_thread.start()
@@ -353,26 +688,73 @@ class HealthMonitor:
     
     def stop_monitoring(self):
         """Stop the health monitoring thread"""
-        self.running = False
+        self._stop_event.set()
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=1)
         logger.info("Health monitoring stopped")
     
     def _monitor_nodes(self):
         """Monitor node health based on heartbeats"""
-        while self.running:
-            current_time = time.time()
-            
-            for node_id, last_heartbeat in list(self.node_manager.node_last_heartbeat.items()):
-                # Check if node has missed heartbeats
-                if current_time - last_heartbeat > self.heartbeat_timeout:
+        while not self._stop_event.is_set():
+            # Only nodes whose latest heartbeat has expired come off the heap
+            cutoff = time.monotonic() - self.heartbeat_timeout
+            with self.node_manager.lock:
+                for node_id in self.node_manager.pop_expired_heartbeats(cutoff):
                     logger.warning(f"Node {node_id} missed heartbeats, marking as unhealthy")
                     self.node_manager.mark_node_unhealthy(node_id)
                     
                     # Reschedule pods from the unhealthy node
                     self.pod_scheduler.reschedule_pods_from_node(node_id)
             
-            time.sleep(5)  # Check every 5 seconds
+            # Wait until the oldest outstanding heartbeat times out, or until stopped
+            oldest = self.node_manager.oldest_heartbeat_time()
+            if oldest is None:
+                delay = self.heartbeat_timeout
+            else:
+                delay = oldest + self.heartbeat_timeout - time.monotonic()
+            self._stop_event.wait(timeout=min(max(delay, 0), self.heartbeat_timeout))
+
+class HeartbeatListener:
+    def __init__(self, node_manager, port):
+        self.node_manager = node_manager
+        self.port = port
+        self.listener_thread = None
+    
+    def start_listening(self):
+        """Start the UDP heartbeat listener thread"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind(('0.0.0.0', self.port))
+        except OSError as e:
+            # The port is never advertised, so launched nodes send their heartbeats over HTTP
+            logger.warning(f"UDP heartbeat listener disabled, could not bind port {self.port}: {str(e)}")
+            sock.close()
+            return
+        
+        # Only nodes launched from now on are told to use UDP
+        _NODE_ENV["HEARTBEAT_UDP_PORT"] = str(self.port)
+        self.listener_thread = threading.Thread(target=self._listen, args=(sock,))
+        self.listener_thread.daemon = True
+        self.listener_thread.start()
+        logger.info(f"UDP heartbeat listener started on port {self.port}")
+    
+    def _listen(self, sock):
+        """Receive heartbeat datagrams, skipping Flask dispatch entirely"""
+        while True:
+            datagram, addr = sock.recvfrom(64)
+            if len(datagram) != _HEARTBEAT_STRUCT.size:
+                continue
+            # A malformed datagram must not kill the listener and with it every node's UDP heartbeats
+            try:
+                raw_node_id, _, _, status = _HEARTBEAT_STRUCT.unpack(datagram)
+                node_id = raw_node_id.rstrip(b'\0').decode()
+            except (UnicodeDecodeError, struct.error):
+                continue
+            if status == 1 and self.node_manager.update_node_heartbeat(node_id):
+                try:
+                    sock.sendto(_HEARTBEAT_ACK, addr)
+                except OSError:
+                    pass
 
 # Initialize components
 node_manager = NodeManager()
@@ -382,32 +764,89 @@ health_monitor = HealthMonitor(node_manager, pod_scheduler)
 # Start health monitoring
 health_monitor.start_monitoring()
 
+# Accept heartbeats over UDP as well as HTTP
+if args.udp_port:
+    HeartbeatListener(node_manager, args.udp_port).start_listening()
+
 # API Endpoints
+def _add_node(data):
+    """Add a node from a request payload, returning the response body and status code"""
+    cpu_cores = data.get('cpu_cores', 1)
+    
+    if not isinstance(cpu_cores, int) or cpu_cores <= 0:
+        return {'error': 'CPU cores must be a positive integer'}, 400
+    
+    node_id, status = node_manager.add_node(cpu_cores)
+    
+    if status == 'pending':
+        # The container is still being launched; poll /nodes/<node_id>/status
+        return {
+            'message': 'Node launch accepted',
+            'node_id': node_id,
+            'cpu_cores': cpu_cores,
+            'status': status
+        }, 202
+    
+    return {
+        'message': 'Node added successfully',
+        'node_id': node_id,
+        'cpu_cores': cpu_cores,
+        'status': status
+    }, 201
+
 @app.route('/nodes', methods=['POST'])
 def add_node():
     """API endpoint to add a new node to the cluster"""
+    return fastjson(*_add_node(request.json))
+
+@app.route('/nodes/register', methods=['POST'])
+def register_node():
+    """API endpoint for a node started outside the server (e.g. co-located nodes) to register itself"""
     data = request.json
+    node_id = data.get('node_id')
     cpu_cores = data.get('cpu_cores', 1)
     
+    if not isinstance(node_id, str) or not node_id:
+        return fastjson({'error': 'Node ID must be a non-empty string'}, 400)
     if not isinstance(cpu_cores, int) or cpu_cores <= 0:
-        return jsonify({'error': 'CPU cores must be a positive integer'}), 400
+        return fastjson({'error': 'CPU cores must be a positive integer'}, 400)
     
-    node_id, success = node_manager.add_node(cpu_cores)
+    if not node_manager.register_external_node(node_id, cpu_cores):
+        return fastjson({'error': 'Node already registered'}, 409)
     
-    if success:
-        return jsonify({
-            'message': 'Node added successfully',
-            'node_id': node_id,
-            'cpu_cores': cpu_cores
-        }), 201
-    else:
-        return jsonify({'error': 'Failed to add node'}), 500
+    return fastjson({
+        'message': 'Node registered successfully',
+        'node_id': node_id,
+        'cpu_cores': cpu_cores,
+        'status': 'healthy'
+    }, 201)
 
 @app.route('/nodes', methods=['GET'])
 def get_nodes():
     """API endpoint to list all nodes in the cluster"""
-    nodes = node_manager.get_nodes()
-    return jsonify({'nodes': nodes}), 200
+    # Encode under the lock so the cached body matches the version it is stored with
+    with node_manager.lock:
+        return cached_json('nodes', node_manager.get_version(), lambda: {'nodes': node_manager.nodes})
+
+@sock.route('/ws/events')
+def cluster_events(ws):
+    """WebSocket endpoint that pushes the cluster version whenever nodes or pods change"""
+    version = node_manager.get_version()
+    ws.send(orjson.dumps({'version': version}).decode())
+    while True:
+        # Wake up periodically and resend the unchanged version as a keepalive,
+        # so a client that went away is noticed and this handler exits
+        version = node_manager.wait_for_change(version, timeout=30)
+        ws.send(orjson.dumps({'version': version}).decode())
+
+@app.route('/nodes/<node_id>/status', methods=['GET'])
+def get_node_status(node_id):
+    """API endpoint to check a single node's status, e.g. while its launch is pending"""
+    status = node_manager.get_node_status(node_id)
+    
+    if status is None:
+        return fastjson({'error': 'Node not found'}, 404)
+    return fastjson({'node_id': node_id, 'status': status}, 200)
 
 @app.route('/nodes/<node_id>/heartbeat', methods=['POST'])
 def node_heartbeat(node_id):
@@ -415,51 +854,139 @@ def node_heartbeat(node_id):
     success = node_manager.update_node_heartbeat(node_id)
     
     if success:
-        return jsonify({'status': 'heartbeat received'}), 200
+        return fastjson({'status': 'heartbeat received'}, 200)
     else:
-        return jsonify({'error': 'Node not found'}), 404
+        return fastjson({'error': 'Node not found'}, 404)
 
-@app.route('/pods', methods=['POST'])
-def create_pod():
-    """API endpoint to create a new pod"""
-    data = request.json
+def _create_pod(data):
+    """Create a pod from a request payload, returning the response body and status code"""
     cpu_requirement = data.get('cpu_requirement', 1)
     algorithm = data.get('algorithm', 'first-fit')
     
     if not isinstance(cpu_requirement, int) or cpu_requirement <= 0:
-        return jsonify({'error': 'CPU requirement must be a positive integer'}), 400
+        return {'error': 'CPU requirement must be a positive integer'}, 400
     
-    if algorithm not in ['first-fit', 'best-fit', 'worst-fit', 'round-robin', 'random-fit']:
-        return jsonify({'error': 'Invalid scheduling algorithm'}), 400
+    if algorithm not in pod_scheduler.algorithms:
+        return {'error': 'Invalid scheduling algorithm'}, 400
     
     pod_id, node_id = pod_scheduler.schedule_pod(cpu_requirement, algorithm)
     
     if pod_id:
-        return jsonify({
+        return {
             'message': 'Pod created successfully',
             'pod_id': pod_id,
             'node_id': node_id,
             'cpu_requirement': cpu_requirement
-        }), 201
+        }, 201
+    else:
+        return {'error': f'Failed to create pod: {node_id}'}, 500
+
+@app.route('/pods', methods=['POST'])
+def create_pod():
+    """API endpoint to create a new pod"""
+    return fastjson(*_create_pod(request.json))
+
+@app.route('/pods/bulk', methods=['POST'])
+def create_pods_bulk():
+    """API endpoint to create a batch of pods, packed with first-fit decreasing"""
+    data = request.json
+    
+    if not isinstance(data, list) or not data:
+        return fastjson({'error': 'Request body must be a non-empty list of pods'}, 400)
+    
+    cpu_requirements = [pod.get('cpu_requirement', 1) if isinstance(pod, dict) else None for pod in data]
+    if not all(isinstance(cpu, int) and cpu > 0 for cpu in cpu_requirements):
+        return fastjson({'error': 'CPU requirement must be a positive integer'}, 400)
+    
+    results = pod_scheduler.schedule_pods_bulk(cpu_requirements)
+    
+    pods = []
+    for cpu_requirement, (pod_id, node_id) in zip(cpu_requirements, results):
+        if pod_id:
+            pods.append({'pod_id': pod_id, 'node_id': node_id, 'cpu_requirement': cpu_requirement})
+        else:
+            pods.append({'error': f'Failed to create pod: {node_id}', 'cpu_requirement': cpu_requirement})
+    
+    scheduled = sum(1 for pod_id, _ in results if pod_id)
+    # 207 when only some pods fit, 503 when none did, so a total failure doesn't look like success
+    if scheduled == len(results):
+        status = 201
+    elif scheduled:
+        status = 207
     else:
-        return jsonify({'error': f'Failed to create pod: {node_id}'}), 500
+        status = 503
+    return fastjson({
+        'message': f'{scheduled} of {len(results)} pods created',
+        'pods': pods
+    }, status)
+
+# Operations accepted by /batch, mapped to the handlers behind their single-item endpoints
+_BATCH_OPS = {
+    'add_node': _add_node,
+    'create_pod': _create_pod,
+}
+
+@app.route('/batch', methods=['POST'])
+def run_batch():
+    """API endpoint to run a list of operations in one request, in order"""
+    data = request.json
+    
+    if not isinstance(data, list):
+        return fastjson({'error': 'Request body must be a list of operations'}, 400)
+    
+    results = []
+    for op in data:
+        handler = _BATCH_OPS.get(op.get('op')) if isinstance(op, dict) else None
+        if handler is None:
+            body, status = {'error': f'Unknown operation, expected one of {sorted(_BATCH_OPS)}'}, 400
+        else:
+            body, status = handler(op)
+        results.append({'op': op.get('op') if isinstance(op, dict) else None, 'status_code': status, 'result': body})
+    
+    return fastjson({'results': results}, 200)
 
 @app.route('/pods', methods=['GET'])
 def get_pods():
     """API endpoint to list all pods in the cluster"""
     pods = pod_scheduler.get_all_pods()
-    return jsonify({'pods': pods}), 200
+    return fastjson({'pods': pods}, 200)
 
 @app.route('/stats', methods=['GET'])
 def get_stats():
     """API endpoint to get cluster statistics"""
-    node_stats = node_manager.get_node_stats()
-    pod_stats = pod_scheduler.get_pod_stats()
+    # Served with the cluster version as ETag, so pollers get an empty 304 while nothing changed
+    with node_manager.lock:
+        return cached_json('stats', node_manager.get_version(), lambda: {
+            'nodes': node_manager.get_node_stats(),
+            'pods': pod_scheduler.get_pod_stats()
+        })
+
+@app.route('/dashboard', methods=['GET'])
+def get_dashboard():
+    """API endpoint returning nodes, pods and statistics in one response for the dashboard"""
+    # Pod placements and removals bump the node version too, so it covers the whole payload
+    with node_manager.lock:
+        return cached_json('dashboard', node_manager.get_version(), lambda: {
+            'nodes': node_manager.nodes,
+            'pods': pod_scheduler.pods,
+            'stats': {
+                'nodes': node_manager.get_node_stats(),
+                'pods': pod_scheduler.get_pod_stats()
+            }
+        })
+
+@app.route('/debug/stats', methods=['GET'])
+def get_debug_stats():
+    """API endpoint to compare the maintained statistics against a full scan"""
+    with node_manager.lock:
+        counters = {'nodes': node_manager.get_node_stats(), 'pods': pod_scheduler.get_pod_stats()}
+        scanned = {'nodes': node_manager.scan_node_stats(), 'pods': pod_scheduler.scan_pod_stats()}
     
-    return jsonify({
-        'nodes': node_stats,
-        'pods': pod_stats
-    }), 200
+    return fastjson({
+        'counters': counters,
+        'scan': scanned,
+        'consistent': counters == scanned
+    }, 200)
 
 @app.route('/nodes/<node_id>/terminate', methods=['POST'])
 def terminate_node(node_id):
@@ -468,26 +995,32 @@ def terminate_node(node_id):
     if success:
         # Trigger pod rescheduling
         pod_scheduler.reschedule_pods_from_node(node_id)
-        return jsonify({'status': 'node terminated'}), 200
+        return fastjson({'status': 'node terminated'}, 200)
     else:
-        return jsonify({'error': 'Node not found'}), 404
+        return fastjson({'error': 'Node not found'}, 404)
 
 @app.route('/', methods=['GET'])
 def home():
     """API endpoint for the home page"""
-    return jsonify({
+    return fastjson({
         'message': 'Kubernetes-like Cluster Simulation API Server',
         'endpoints': {
             'GET /': 'This help message',
             'GET /nodes': 'List all nodes',
             'POST /nodes': 'Add a new node',
+            'POST /nodes/register': 'Register a node started outside the server',
+            'GET /nodes/<node_id>/status': 'Get the status of a node',
             'GET /pods': 'List all pods',
             'POST /pods': 'Create a new pod',
-            'GET /stats': 'Get cluster statistics'
+            'POST /pods/bulk': 'Create a batch of pods',
+            'POST /batch': 'Run a list of add_node/create_pod operations',
+            'GET /stats': 'Get cluster statistics',
+            'GET /dashboard': 'Get nodes, pods and statistics in one response',
+            'WS /ws/events': 'Stream the cluster version whenever nodes or pods change'
         }
-    }), 200
+    }, 200)
 
 if __name__ == '__main__':
     print(f"Starting API Server on port {args.port}...")
     print(f"Access the API server at http://localhost:{args.port}")
-    app.run(host='0.0.0.0', port=args.port, debug=True)
+    app.run(host='0.0.0.0', port=args.port)
@@ -1,27 +1,134 @@
-import requests
 import argparse
-import json
 import sys
 import time
 import os
-from tabulate import tabulate
+import hashlib
+import pickle
+
+# Prefer orjson for encoding and decoding API payloads, falling back to the stdlib
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _loads = json.loads
+    _dumps = json.dumps
 
 # Default API server URL with port 5001 (changed from 5000)
 API_SERVER_URL = "http://localhost:5001"
 
+# Shared session so repeated calls reuse pooled keep-alive connections; created on first use
+# so that --help and argument errors never pay for importing requests
+_SESSION = None
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def _http():
+    """Get the shared HTTP session, importing requests the first time it is needed"""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        _SESSION = requests.Session()
+        _SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                              max_retries=Retry(total=2, backoff_factor=0.1)))
+    return _SESSION
+
+def post_json(url, payload):
+    """POST a JSON payload encoded with the fast encoder"""
+    return _http().post(url, data=_dumps(payload), headers=_JSON_HEADERS)
+
+# Read responses are cached on disk for a few seconds so scripted or watched calls skip the round-trip
+CACHE_DIR = os.path.expanduser("~/.cache/cluster_cli")
+USE_CACHE = True
+# Render tables with tabulate's grid format instead of the plain fixed-width formatter
+PRETTY = False
+
+def _cache_path(url):
+    """Get the cache file used for a URL"""
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest())
+
+def _cache_get(url, ttl):
+    """Get the cached entry {ts, body} for a URL and whether it is younger than ttl seconds"""
+    try:
+        with open(_cache_path(url), 'rb') as f:
+            entry = pickle.load(f)
+    except Exception:
+        return None, False
+    return entry, time.time() - entry['ts'] < ttl
+
+def _cache_put(url, body):
+    """Store a response body in the cache"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(url), 'wb') as f:
+            pickle.dump({'ts': time.time(), 'body': body}, f)
+    except OSError:
+        pass
+
+def _cache_clear():
+    """Drop all cached responses, e.g. after the cluster state was changed"""
+    try:
+        for name in os.listdir(CACHE_DIR):
+            os.remove(os.path.join(CACHE_DIR, name))
+    except OSError:
+        pass
+
+def cached_get(url, ttl):
+    """GET a JSON endpoint through the cache; returns (ok, data) or (False, error text)"""
+    entry, fresh = _cache_get(url, ttl)
+    if USE_CACHE and fresh:
+        return True, entry['body']
+    
+    try:
+        response = _http().get(url)
+    except OSError as e:  # requests.RequestException is an OSError subclass
+        # Serve the last known state rather than nothing if the API server is unreachable,
+        # unless --no-cache asked for live data only
+        if entry is None or not USE_CACHE:
+            raise
+        print(f"Warning: API server unreachable ({str(e)}), showing data from {time.time() - entry['ts']:.0f}s ago")
+        return True, entry['body']
+    
+    if response.status_code != 200:
+        return False, response.text
+    data = _loads(response.content)
+    _cache_put(url, data)
+    return True, data
+
+def print_table(headers, rows, row_format):
+    """Print rows with a fixed-width format string, or as a tabulate grid under --pretty"""
+    if PRETTY:
+        from tabulate import tabulate
+        print(tabulate(rows, headers=headers, tablefmt='grid'))
+        return
+    lines = [row_format.format(*headers)]
+    lines.extend([row_format.format(*row) for row in rows])
+    print("\n".join(lines))
+
+def id_width(ids, header):
+    """Get the column width needed for a column of IDs"""
+    return max(len(header), max(map(len, ids), default=0))
+
 def add_node(args):
     """Add a new node to the cluster"""
     try:
-        response = requests.post(
+        response = post_json(
             f"{API_SERVER_URL}/nodes",
-            json={'cpu_cores': args.cpu_cores}
+            {'cpu_cores': args.cpu_cores}
         )
         
-        if response.status_code == 201:
-            data = response.json()
-            print(f"Node added successfully!")
+        if response.status_code in (201, 202):
+            data = _loads(response.content)
+            if response.status_code == 202:
+                print("Node launch accepted!")
+            else:
+                print("Node added successfully!")
             print(f"Node ID: {data['node_id']}")
             print(f"CPU Cores: {data['cpu_cores']}")
+            print(f"Status: {data.get('status', 'healthy')}")
+            _cache_clear()
         else:
             print(f"Failed to add node: {response.text}")
             
@@ -31,10 +138,9 @@ def add_node(args):
 def list_nodes(args):
     """List all nodes in the cluster"""
     try:
-        response = requests.get(f"{API_SERVER_URL}/nodes")
+        ok, data = cached_get(f"{API_SERVER_URL}/nodes", ttl=3)
         
-        if response.status_code == 200:
-            data = response.json()
+        if ok:
             nodes = data.get('nodes', {})
             
             if not nodes:
@@ -54,14 +160,15 @@ def list_nodes(args):
             
             # Print table
             print("\nNodes in the cluster:")
-            print(tabulate(
+            width = id_width(nodes, 'Node ID')
+            print_table(
+                ['Node ID', 'CPU Cores', 'Available', 'Status', 'Pods'],
                 table_data,
-                headers=['Node ID', 'CPU Cores', 'Available', 'Status', 'Pods'],
-                tablefmt='grid'
-            ))
+                f"{{:<{width}}} {{:>9}} {{:>9}} {{:<9}} {{}}"
+            )
                 
         else:
-            print(f"Failed to list nodes: {response.text}")
+            print(f"Failed to list nodes: {data}")
             
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -69,20 +176,21 @@ def list_nodes(args):
 def create_pod(args):
     """Create a new pod in the cluster"""
     try:
-        response = requests.post(
+        response = post_json(
             f"{API_SERVER_URL}/pods",
-            json={
+            {
                 'cpu_requirement': args.cpu_requirement,
                 'algorithm': args.algorithm
             }
         )
         
         if response.status_code == 201:
-            data = response.json()
-            print(f"Pod created successfully!")
+            data = _loads(response.content)
+            print("Pod created successfully!")
             print(f"Pod ID: {data['pod_id']}")
             print(f"Scheduled on Node: {data['node_id']}")
             print(f"CPU Requirement: {data['cpu_requirement']}")
+            _cache_clear()
         else:
             print(f"Failed to create pod: {response.text}")
             
@@ -92,10 +200,9 @@ def create_pod(args):
 def list_pods(args):
     """List all pods in the cluster"""
     try:
-        response = requests.get(f"{API_SERVER_URL}/pods")
+        ok, data = cached_get(f"{API_SERVER_URL}/pods", ttl=3)
         
-        if response.status_code == 200:
-            data = response.json()
+        if ok:
             pods = data.get('pods', {})
             
             if not pods:
@@ -113,14 +220,15 @@ def list_pods(args):
             
             # Print table
             print("\nPods in the cluster:")
-            print(tabulate(
+            width = id_width(pods, 'Pod ID')
+            print_table(
+                ['Pod ID', 'CPU Requirement', 'Node ID'],
                 table_data,
-                headers=['Pod ID', 'CPU Requirement', 'Node ID'],
-                tablefmt='grid'
-            ))
+                f"{{:<{width}}} {{:>15}} {{}}"
+            )
                 
         else:
-            print(f"Failed to list pods: {response.text}")
+            print(f"Failed to list pods: {data}")
             
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -128,10 +236,9 @@ def list_pods(args):
 def show_stats(args):
     """Show cluster statistics"""
     try:
-        response = requests.get(f"{API_SERVER_URL}/stats")
+        ok, data = cached_get(f"{API_SERVER_URL}/stats", ttl=5)
         
-        if response.status_code == 200:
-            data = response.json()
+        if ok:
             node_stats = data.get('nodes', {})
             pod_stats = data.get('pods', {})
             
@@ -156,55 +263,98 @@ def show_stats(args):
                     print(f"  Node {node_id}: {pod_count} pods")
                 
         else:
-            print(f"Failed to get statistics: {response.text}")
+            print(f"Failed to get statistics: {data}")
             
     except Exception as e:
         print(f"Error: {str(e)}")
 
+def run_batch(args):
+    """Run a file of operations in a single request"""
+    try:
+        with open(args.file, 'rb') as f:
+            ops = _loads(f.read())
+        
+        response = post_json(f"{API_SERVER_URL}/batch", ops)
+        
+        if response.status_code == 200:
+            results = _loads(response.content).get('results', [])
+            
+            # Prepare table data
+            table_data = []
+            for result in results:
+                body = result['result']
+                table_data.append([
+                    result['op'] or '',
+                    result['status_code'],
+                    body.get('node_id', ''),
+                    body.get('pod_id', ''),
+                    body.get('error', body.get('message', ''))
+                ])
+            
+            # Print table
+            print("\nBatch results:")
+            node_width = id_width([row[2] for row in table_data], 'Node ID')
+            pod_width = id_width([row[3] for row in table_data], 'Pod ID')
+            print_table(
+                ['Operation', 'Status', 'Node ID', 'Pod ID', 'Message'],
+                table_data,
+                f"{{:<10}} {{:>6}} {{:<{node_width}}} {{:<{pod_width}}} {{}}"
+            )
+            _cache_clear()
+        else:
+            print(f"Failed to run batch: {response.text}")
+            
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+# Subcommands as (name, help, [(flags, add_argument kwargs), ...], handler)
+COMMANDS = [
+    ("add-node", "Add a new node to the cluster",
+     [(("--cpu-cores",), dict(type=int, default=1, help="Number of CPU cores for the node"))],
+     add_node),
+    ("list-nodes", "List all nodes in the cluster", [], list_nodes),
+    ("create-pod", "Create a new pod in the cluster",
+     [(("--cpu-requirement",), dict(type=int, default=1, help="CPU requirement for the pod")),
+      (("--algorithm",), dict(choices=["first-fit", "best-fit", "worst-fit", "round-robin", "random-fit"],
+                           default="first-fit", help="Scheduling algorithm to use"))],
+     create_pod),
+    ("list-pods", "List all pods in the cluster", [], list_pods),
+    ("show-stats", "Show cluster statistics", [], show_stats),
+    ("batch", "Run a JSON list of operations in one request",
+     [(("-f", "--file"), dict(required=True,
+                  help='JSON file like [{"op": "add_node", "cpu_cores": 4}, {"op": "create_pod", "cpu_requirement": 2}]'))],
+     run_batch),
+]
+
 def main():
     parser = argparse.ArgumentParser(description="Kubernetes-like Cluster Simulation CLI")
     
     # Add optional argument to specify API server URL
     parser.add_argument("--api-url", help="API server URL (default: http://localhost:5001)")
+    parser.add_argument("--pretty", action="store_true", help="Render tables as grids using tabulate")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always query the API server instead of reusing responses from the last few seconds")
     
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
-    
-    # Add node command
-    add_node_parser = subparsers.add_parser("add-node", help="Add a new node to the cluster")
-    add_node_parser.add_argument("--cpu-cores", type=int, default=1, help="Number of CPU cores for the node")
-    
-    # List nodes command
-    list_nodes_parser = subparsers.add_parser("list-nodes", help="List all nodes in the cluster")
-    
-    # Create pod command
-    create_pod_parser = subparsers.add_parser("create-pod", help="Create a new pod in the cluster")
-    create_pod_parser.add_argument("--cpu-requirement", type=int, default=1, help="CPU requirement for the pod")
-    create_pod_parser.add_argument("--algorithm", choices=["first-fit", "best-fit", "worst-fit"], default="first-fit", 
-                                  help="Scheduling algorithm to use")
-    
-    # List pods command
-    list_pods_parser = subparsers.add_parser("list-pods", help="List all pods in the cluster")
-    
-    # Show stats command
-    show_stats_parser = subparsers.add_parser("show-stats", help="Show cluster statistics")
+    for name, help_text, flags, func in COMMANDS:
+        command_parser = subparsers.add_parser(name, help=help_text)
+        for names, kwargs in flags:
+            command_parser.add_argument(*names, **kwargs)
+        command_parser.set_defaults(func=func)
     
     args = parser.parse_args()
     
     # Update API server URL if provided
-    global API_SERVER_URL
+    global API_SERVER_URL, USE_CACHE, PRETTY
     if args.api_url:
         API_SERVER_URL = args.api_url
+    if args.no_cache:
+        USE_CACHE = False
+    PRETTY = args.pretty
     
-    if args.command == "add-node":
-        add_node(args)
-    elif args.command == "list-nodes":
-        list_nodes(args)
-    elif args.command == "create-pod":
-        create_pod(args)
-    elif args.command == "list-pods":
-        list_pods(args)
-    elif args.command == "show-stats":
-        show_stats(args)
+    # Each subcommand parser sets the function that handles it
+    if hasattr(args, 'func'):
+        args.func(args)
     else:
         parser.print_help()
 
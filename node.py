@@ -1,86 +1,333 @@
-import requests
-import time
+import aiohttp
+import yarl
+import argparse
+import asyncio
+import random
 import sys
 import uuid
 import logging
 import signal
+import socket
+import struct
 import os
+from urllib.parse import urlparse
+
+# Prefer orjson for encoding heartbeats, falling back to the stdlib
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _dumps = json.dumps
+
+# Heartbeat datagram layout, shared with api_server.py: node_id, available_cores, pod_count, status (1 = healthy)
+_HEARTBEAT_STRUCT = struct.Struct("!16sHHB")
+_UDP_MAX_CORES = 0xFFFF
+# The API server's reply to a heartbeat datagram; without one in time the heartbeat is resent over HTTP
+_HEARTBEAT_ACK = b"\x01"
+_UDP_ACK_TIMEOUT = 0.5
+
+# Extra attempts for heartbeats answered with a transient gateway error
+_HEARTBEAT_RETRIES = 1
+_RETRY_STATUSES = (502, 503, 504)
+
+# Settings from the environment, read once at import rather than per node
+_API_SERVER_URL = os.environ.get("API_SERVER_URL", "http://localhost:5001")
+_HEARTBEAT_UDP_PORT = os.environ.get("HEARTBEAT_UDP_PORT")
+_NODE_ID = os.environ.get("NODE_ID")
+_CPU_CORES = os.environ.get("CPU_CORES")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _new_session():
+    """Create the pooled HTTP session used for heartbeats"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=30)
+    )
+
 class Node:
-    def __init__(self, node_id, cpu_cores):
+    def __init__(self, node_id, cpu_cores, session=None, self_register=False):
         self.node_id = node_id
         self.cpu_cores = int(cpu_cores)
         self.available_cores = self.cpu_cores
-        self.pods = []  # List to store pod IDs
+        self.pods = set()  # Set of pod IDs
         
-        # Get API server URL from environment variable or use default
-        self.api_server_url = os.environ.get("API_SERVER_URL", "http://localhost:5001")
-        logger.info(f"Using API server URL: {self.api_server_url}")
+        self.api_server_url = _API_SERVER_URL
+        
+        # Parts of the heartbeat request that never change, built once
+        # Parsed once so aiohttp does not re-parse the URL string on every heartbeat
+        self._hb_url = yarl.URL(self.api_server_url + "/nodes/" + self.node_id + "/heartbeat")
+        # Last encoded heartbeat body and the state it was built from, reused while unchanged
+        self._hb_body = None
+        self._hb_state = None
+        self._hb_headers = {'Content-Type': 'application/json'}
+        # Bound connect and read separately so a hung API server cannot stall the loop
+        self._hb_timeout = aiohttp.ClientTimeout(sock_connect=0.5, sock_read=2.0)
+        
+        # Send heartbeats as single UDP datagrams when the API server listens for them
+        self._sock = None
+        udp_port = _HEARTBEAT_UDP_PORT
+        # The datagram has a fixed 16-byte node_id field and 16-bit core count, so nodes
+        # that don't fit stay on HTTP
+        if udp_port and len(self.node_id.encode()) <= 16 and self.cpu_cores <= _UDP_MAX_CORES:
+            try:
+                self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                # Connecting a UDP socket only fixes the destination, resolving the host once
+                self._sock.connect((urlparse(self.api_server_url).hostname, int(udp_port)))
+                self._sock.setblocking(False)
+                self._node_id_bytes = self.node_id.encode()
+                logger.info("Sending UDP heartbeats to port %s", udp_port)
+            except (OSError, ValueError) as e:
+                logger.warning("Node %s: UDP heartbeats unavailable, using HTTP - %s", self.node_id, e)
+                self._sock = None
         
         self.running = True
+        # A session passed in is shared with other co-located nodes and owned by the caller;
+        # otherwise one is created in __aenter__, since it must be opened inside the event loop
+        self._session = session
+        self._owns_session = session is None
+        # Nodes the API server did not launch register themselves, again whenever the server forgets them
+        self.self_register = self_register
+        # Consecutive failed heartbeats, used to back off while the API server is down
+        self._fail_count = 0
+    
+    async def __aenter__(self):
+        # Reuse one pooled keep-alive connection for every heartbeat
+        if self._owns_session:
+            self._session = _new_session()
+        return self
     
-    def send_heartbeat(self):
-        """Send heartbeat signal to the API server"""
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._owns_session:
+            await self._session.close()
+        if self._sock is not None:
+            self._sock.close()
+    
+    async def register(self):
+        """Register this node with the API server, for nodes the server did not launch itself"""
         try:
-            response = requests.post(
-                f"{self.api_server_url}/nodes/{self.node_id}/heartbeat",
-                json={
-                    'status': 'healthy',
-                    'available_cores': self.available_cores,
-                    'pods': self.pods
-                }
-            )
-            
-            if response.status_code == 200:
-                logger.debug(f"Node {self.node_id}: Heartbeat sent successfully")
-            else:
-                logger.warning(f"Node {self.node_id}: Failed to send heartbeat - {response.status_code}: {response.text}")
+            async with self._session.post(
+                f"{self.api_server_url}/nodes/register",
+                data=_dumps({'node_id': self.node_id, 'cpu_cores': self.cpu_cores}),
+                headers=self._hb_headers,
+                timeout=self._hb_timeout
+            ) as response:
+                if response.status in (200, 201):
+                    logger.info("Node %s: Registered with the API server", self.node_id)
+                    return True
+                # The server still holds this id as live: either this process restarted within the
+                # health window, or another process is running a node under the same id
+                if response.status == 409:
+                    logger.warning("Node %s: ID is already registered as a live node, "
+                                   "continuing with it - check for a duplicate --id-prefix", self.node_id)
+                    return True
+                logger.warning("Node %s: Failed to register - %s: %s", self.node_id, response.status, await response.text())
+                return False
+        except Exception as e:
+            logger.error("Node %s: Error registering - %s", self.node_id, e)
+            return False
+    
+    async def send_heartbeat(self):
+        """Send heartbeat signal to the API server, returning whether it was delivered"""
+        # A lost or unacknowledged datagram falls through to a regular HTTP heartbeat
+        if self._sock is not None and await self._send_udp_heartbeat():
+            return True
+        
+        try:
+            body = self._heartbeat_body()
+            for attempt in range(1 + _HEARTBEAT_RETRIES):
+                async with self._session.post(
+                    self._hb_url,
+                    data=body,
+                    headers=self._hb_headers,
+                    timeout=self._hb_timeout
+                ) as response:
+                    if response.status == 200:
+                        logger.debug("Node %s: Heartbeat sent successfully", self.node_id)
+                        return True
+                    # Retry transient gateway errors once before counting the heartbeat as failed
+                    if response.status in _RETRY_STATUSES and attempt < _HEARTBEAT_RETRIES:
+                        await asyncio.sleep(0.1 * (2 ** attempt))
+                        continue
+                    # The API server keeps cluster state in memory and loses it on restart
+                    if response.status == 404 and self.self_register:
+                        return await self.register()
+                    logger.warning("Node %s: Failed to send heartbeat - %s: %s", self.node_id, response.status, await response.text())
+                    return False
                 
+        except asyncio.TimeoutError:
+            logger.error("Node %s: Heartbeat timed out", self.node_id)
+            return False
         except Exception as e:
-            logger.error(f"Node {self.node_id}: Error sending heartbeat - {str(e)}")
+            logger.error("Node %s: Error sending heartbeat - %s", self.node_id, e)
+            return False
     
-    def start_heartbeat_loop(self):
-        """Start sending periodic heartbeats to the API server"""
-        logger.info(f"Node {self.node_id}: Starting heartbeat loop")
+    def _heartbeat_body(self):
+        """Get the encoded heartbeat body, only re-encoding it when the node's state changed"""
+        if self._hb_state is None or self._hb_state != (self.available_cores, self.pods):
+            self._hb_body = _dumps({
+                'status': 'healthy',
+                'available_cores': self.available_cores,
+                'pods': list(self.pods)
+            })
+            self._hb_state = (self.available_cores, set(self.pods))
+        return self._hb_body
+    
+    async def _send_udp_heartbeat(self):
+        """Send a heartbeat as one packed datagram and wait briefly for the API server to acknowledge it"""
+        try:
+            # Discard acknowledgements that arrived after an earlier heartbeat had timed out
+            while True:
+                self._sock.recv(16)
+        except OSError:
+            pass  # Nothing left to read, or an earlier datagram was refused
         
-        while self.running:
-            self.send_heartbeat()
-            time.sleep(5)  # Send heartbeat every 5 seconds
+        try:
+            self._sock.send(_HEARTBEAT_STRUCT.pack(
+                self._node_id_bytes, self.available_cores, len(self.pods), 1
+            ))
+            ack = await asyncio.wait_for(asyncio.get_running_loop().sock_recv(self._sock, 16), _UDP_ACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Node %s: UDP heartbeat not acknowledged, sending it over HTTP", self.node_id)
+            return False
+        except (OSError, struct.error) as e:
+            logger.warning("Node %s: Error sending UDP heartbeat, sending it over HTTP - %s", self.node_id, e)
+            return False
+        logger.debug("Node %s: UDP heartbeat acknowledged", self.node_id)
+        return ack == _HEARTBEAT_ACK
+    
+    def next_heartbeat_delay(self, delivered):
+        """Get the seconds until the next heartbeat, backing off while heartbeats fail"""
+        if delivered:
+            self._fail_count = 0
+            return 5  # Send heartbeat every 5 seconds
+        # Back off exponentially with jitter so nodes don't retry a recovering server in lockstep.
+        # The first retry keeps the normal interval so one failure stays inside the server's
+        # 15 second heartbeat timeout instead of getting the node marked unhealthy.
+        self._fail_count += 1
+        return min(60, 5 * (1 << min(self._fail_count - 1, 4))) + random.random()
     
-    def handle_shutdown(self, signum, frame):
+    def handle_shutdown(self):
         """Handle graceful shutdown"""
-        logger.info(f"Node {self.node_id}: Shutting down...")
+        logger.info("Node %s: Shutting down...", self.node_id)
         self.running = False
 
+class HeartbeatScheduler:
+    """Drives the heartbeats of any number of nodes from timers on one event loop"""
+    
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._nodes = []
+        self._timers = {}  # {node_id: TimerHandle of its next heartbeat}
+        self._inflight = set()  # Heartbeat tasks currently awaiting the API server
+        self._stopped = self._loop.create_future()
+    
+    def add(self, node, delay=0):
+        """Start sending heartbeats for a node after the given delay"""
+        logger.info("Node %s: Starting heartbeat loop", node.node_id)
+        self._nodes.append(node)
+        self._timers[node.node_id] = self._loop.call_later(delay, self._tick, node)
+    
+    def _tick(self, node):
+        task = self._loop.create_task(self._beat(node, self._loop.time()))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+    
+    async def _beat(self, node, started):
+        try:
+            delay = node.next_heartbeat_delay(await node.send_heartbeat())
+        except Exception:
+            # Count it as a failed heartbeat so one bad tick can't stop the node's timer for good
+            logger.exception("Node %s: Unexpected error sending heartbeat", node.node_id)
+            delay = node.next_heartbeat_delay(False)
+        if node.running:
+            # Measured from when this heartbeat started, so a slow request does not cause drift
+            self._timers[node.node_id] = self._loop.call_at(started + delay, self._tick, node)
+    
+    def stop(self):
+        """Shut every node down and cancel their pending heartbeats"""
+        for node in self._nodes:
+            node.handle_shutdown()
+        for timer in self._timers.values():
+            timer.cancel()
+        for task in self._inflight:
+            task.cancel()
+        if not self._stopped.done():
+            self._stopped.set_result(None)
+    
+    def install_signal_handlers(self):
+        """Stop the scheduler on SIGTERM/SIGINT"""
+        self._loop.add_signal_handler(signal.SIGTERM, self.stop)
+        self._loop.add_signal_handler(signal.SIGINT, self.stop)
+    
+    async def run(self):
+        """Wait until the scheduler is stopped"""
+        await self._stopped
+
+async def run_node(node_id, cpu_cores):
+    """Run a node's heartbeat loop until it is signalled to shut down"""
+    async with Node(node_id, cpu_cores) as node:
+        scheduler = HeartbeatScheduler()
+        # Register signal handlers for graceful shutdown
+        scheduler.install_signal_handlers()
+        
+        logger.info("Node %s started with %s CPU cores", node_id, cpu_cores)
+        
+        # Start sending heartbeats
+        scheduler.add(node)
+        await scheduler.run()
+
+async def run_colocated_nodes(count, id_prefix, cpu_cores):
+    """Run many self-registering nodes in one process, sharing one event loop and HTTP session"""
+    async with _new_session() as session:
+        nodes = [Node(f"{id_prefix}-{i}", cpu_cores, session, self_register=True) for i in range(count)]
+        scheduler = HeartbeatScheduler()
+        # Register signal handlers for graceful shutdown of every node
+        scheduler.install_signal_handlers()
+        
+        # These nodes were not launched by the API server, so it has to be told about them
+        await asyncio.gather(*(node.register() for node in nodes))
+        logger.info("Started %s co-located nodes with %s CPU cores each", count, cpu_cores)
+        
+        # Spread the nodes over one heartbeat interval instead of sending them all at once
+        for i, node in enumerate(nodes):
+            scheduler.add(node, delay=5 * i / count)
+        await scheduler.run()
+
 def main():
+    parser = argparse.ArgumentParser(description="Cluster simulation node")
+    parser.add_argument("node_id", nargs="?", help="ID of this node, as assigned by the API server")
+    parser.add_argument("cpu_cores", nargs="?", help="Number of CPU cores of this node")
+    parser.add_argument("--count", type=int, help="Run this many co-located nodes in one process instead")
+    parser.add_argument("--id-prefix", default="node", help="ID prefix for co-located nodes (default: node)")
+    parser.add_argument("--cpu-cores", type=int, default=1, dest="colocated_cores",
+                        help="CPU cores of each co-located node (default: 1)")
+    args = parser.parse_args()
+    
+    logger.info("Using API server URL: %s", _API_SERVER_URL)
+    
+    if args.count:
+        asyncio.run(run_colocated_nodes(args.count, args.id_prefix, args.colocated_cores))
+        return
+    
     # Get node ID and CPU cores from environment variables or command line
-    node_id = os.environ.get("NODE_ID")
-    cpu_cores = os.environ.get("CPU_CORES")
+    node_id = _NODE_ID
+    cpu_cores = _CPU_CORES
     
     if not node_id or not cpu_cores:
         # Fall back to command line arguments if env vars not provided
-        if len(sys.argv) < 3:
+        if not args.node_id or not args.cpu_cores:
             logger.error("Usage: python node.py <node_id> <cpu_cores>")
             logger.error("Or set NODE_ID and CPU_CORES environment variables")
+            logger.error("Or run co-located nodes with --count N [--id-prefix P] [--cpu-cores C]")
             sys.exit(1)
-        node_id = sys.argv[1]
-        cpu_cores = sys.argv[2]
-    
-    # Register signal handlers for graceful shutdown
-    signal.signal(signal.SIGTERM, lambda signum, frame: node.handle_shutdown(signum, frame))
-    signal.signal(signal.SIGINT, lambda signum, frame: node.handle_shutdown(signum, frame))
+        node_id = args.node_id
+        cpu_cores = args.cpu_cores
     
     # Create and start the node
-    node = Node(node_id, cpu_cores)
-    
-    logger.info(f"Node {node_id} started with {cpu_cores} CPU cores")
-    
-    # Start sending heartbeats
-    node.start_heartbeat_loop()
+    asyncio.run(run_node(node_id, cpu_cores))
 
 if __name__ == "__main__":
     main()
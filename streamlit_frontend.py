@@ -1,12 +1,28 @@
 import streamlit as st
+import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import time
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import os
+import logging
+from websockets.sync.client import connect as ws_connect
+
+# Prefer orjson for decoding API payloads, falling back to the stdlib
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
 
 # Set page configuration
 st.set_page_config(
@@ -17,7 +33,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -51,7 +67,8 @@ st.markdown("""
         width: 100%;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CSS, unsafe_allow_html=True)
 
 # Initialize session state
 if 'api_url' not in st.session_state:
@@ -62,121 +79,157 @@ if 'auto_refresh' not in st.session_state:
     st.session_state.auto_refresh = False
 if 'refresh_interval' not in st.session_state:
     st.session_state.refresh_interval = 5
-if 'refresh_thread' not in st.session_state:
-    st.session_state.refresh_thread = None
-if 'refresh_active' not in st.session_state:
-    st.session_state.refresh_active = False
+if 'rendered_version' not in st.session_state:
+    st.session_state.rendered_version = None
+if 'dashboard_data' not in st.session_state:
+    # (nodes, pods, stats) of the rendered_version, redrawn while the cluster is unchanged
+    st.session_state.dashboard_data = None
+
+# Reports whether the browser tab is hidden, so hidden dashboards stop polling the API server
+page_visibility = components.declare_component(
+    "page_visibility", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "page_visibility")
+)
+
+# Connect and read timeouts for API calls, so a hung API server can't freeze a rerun
+API_TIMEOUT = (0.5, 2.0)
+# The WebSocket client takes a single number for its opening handshake
+WS_OPEN_TIMEOUT = API_TIMEOUT[0]
+
+# One pooled keep-alive session shared by every rerun and user session, instead of
+# a fresh TCP connection per API call
+@st.cache_resource
+def get_session():
+    session = requests.Session()
+    # Retry transient failures of reads up to 3 times, waiting 0.1/0.2/0.4 s, before showing an error.
+    # POSTs are only retried when the connection could not be made, so a slow add-node or
+    # create-pod can't be sent twice and launch a duplicate
+    retry = Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504],
+                  allowed_methods=['GET'])
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return session
+
+# The last response of each endpoint served with an ETag, {url: (etag, data)}, shared by every
+# session since the memoized reads that use it are too
+@st.cache_resource
+def get_etag_store():
+    return {}, threading.Lock()
+
+def conditional_get(url):
+    """GET a JSON endpoint, sending the last ETag so unchanged data comes back as an empty 304"""
+    store, lock = get_etag_store()
+    with lock:
+        cached = store.get(url)
+    headers = {'If-None-Match': cached[0]} if cached else None
+    response = get_session().get(url, headers=headers, timeout=API_TIMEOUT)
+    if response.status_code == 304 and cached:
+        return response, cached[1]
+    if response.status_code != 200:
+        return response, None
+    data = _loads(response.content)
+    if 'ETag' in response.headers:
+        with lock:
+            store[url] = (response.headers['ETag'], data)
+    return response, data
+
+class APIError(Exception):
+    """The API server answered a request with an error response"""
 
 # Functions to interact with the API
-def get_nodes():
-    try:
-        response = requests.get(f"{st.session_state.api_url}/nodes")
-        if response.status_code == 200:
-            data = response.json()
-            # Handle both dictionary and list responses
-            if isinstance(data, dict) and 'nodes' in data:
-                return data.get('nodes', {})
-            elif isinstance(data, list):
-                # Convert list of nodes to dictionary format
-                nodes_dict = {}
-                for node in data:
-                    if isinstance(node, dict) and 'node_id' in node:
-                        node_id = node['node_id']
-                        nodes_dict[node_id] = node
-                return nodes_dict
-            return {}
-        else:
-            st.error(f"Failed to fetch nodes: {response.text}")
-            return {}
-    except Exception as e:
-        st.error(f"Error connecting to API server: {str(e)}")
-        return {}
+# They raise on failure instead of reporting it, so a transient error is never memoized
+def get_nodes(api_url):
+    response = get_session().get(f"{api_url}/nodes", timeout=API_TIMEOUT)
+    if response.status_code != 200:
+        raise APIError(f"Failed to fetch nodes: {response.text}")
+    data = _loads(response.content)
+    # Handle both dictionary and list responses
+    if isinstance(data, dict) and 'nodes' in data:
+        return data.get('nodes', {})
+    elif isinstance(data, list):
+        # Convert list of nodes to dictionary format
+        nodes_dict = {}
+        for node in data:
+            if isinstance(node, dict) and 'node_id' in node:
+                node_id = node['node_id']
+                nodes_dict[node_id] = node
+        return nodes_dict
+    return {}
 
-def get_pods():
-    try:
-        response = requests.get(f"{st.session_state.api_url}/pods")
-        if response.status_code == 200:
-            data = response.json()
-            # Handle both dictionary and list responses
-            if isinstance(data, dict) and 'pods' in data:
-                return data.get('pods', {})
-            elif isinstance(data, list):
-                # Convert list of pods to dictionary format
-                pods_dict = {}
-                for pod in data:
-                    if isinstance(pod, dict) and 'pod_id' in pod:
-                        pod_id = pod['pod_id']
-                        pods_dict[pod_id] = pod
-                return pods_dict
-            return {}
-        else:
-            st.error(f"Failed to fetch pods: {response.text}")
-            return {}
-    except Exception as e:
-        st.error(f"Error connecting to API server: {str(e)}")
-        return {}
+def get_pods(api_url):
+    response = get_session().get(f"{api_url}/pods", timeout=API_TIMEOUT)
+    if response.status_code != 200:
+        raise APIError(f"Failed to fetch pods: {response.text}")
+    data = _loads(response.content)
+    # Handle both dictionary and list responses
+    if isinstance(data, dict) and 'pods' in data:
+        return data.get('pods', {})
+    elif isinstance(data, list):
+        # Convert list of pods to dictionary format
+        pods_dict = {}
+        for pod in data:
+            if isinstance(pod, dict) and 'pod_id' in pod:
+                pod_id = pod['pod_id']
+                pods_dict[pod_id] = pod
+        return pods_dict
+    return {}
+
+def get_stats(api_url):
+    response, data = conditional_get(f"{api_url}/stats")
+    if data is None:
+        raise APIError(f"Failed to fetch stats, the API server must expose /stats: {response.text}")
+    return data
 
-def get_stats():
+def refresh_window():
+    """Get the number of the current refresh interval, so memoized reads expire once per interval"""
+    return int(time.time() // st.session_state.refresh_interval)
+
+# Memoized across sessions and reruns. The window makes a read expire once per refresh interval,
+# and the version pushed over /ws/events makes a cluster change fetched right away; the ttl
+# (the longest refresh interval) only evicts entries of past windows
+@st.cache_data(ttl=30, show_spinner=False)
+def get_dashboard(api_url, version=None, window=None):
+    """Fetch nodes, pods and stats in a single request, falling back to the separate endpoints"""
+    response, data = conditional_get(f"{api_url}/dashboard")
+    if data is not None:
+        return data.get('nodes', {}), data.get('pods', {}), data.get('stats', {'nodes': {}, 'pods': {}})
+    # Any other failure is reported as is instead of paying the retries and timeouts again below
+    if response.status_code != 404:
+        raise APIError(f"Failed to fetch dashboard: {response.text}")
+    # Older API servers have no /dashboard endpoint; fetch the three endpoints concurrently.
+    # The workers get this script run's context for the st.cache_resource lookups inside them
+    with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx,
+                            initargs=(None, get_script_run_ctx())) as executor:
+        nodes = executor.submit(get_nodes, api_url)
+        pods = executor.submit(get_pods, api_url)
+        stats = executor.submit(get_stats, api_url)
+        return nodes.result(), pods.result(), stats.result()
+
+def load_dashboard(api_url, version):
+    """Get nodes, pods and stats, reporting a failed fetch on the page; returns None on failure"""
     try:
-        response = requests.get(f"{st.session_state.api_url}/stats")
-        if response.status_code == 200:
-            return response.json()
-        else:
-            # If stats endpoint doesn't exist, calculate stats from nodes and pods
-            nodes = get_nodes()
-            pods = get_pods()
-            
-            # Calculate node stats
-            total_nodes = len(nodes)
-            healthy_nodes = sum(1 for node_info in nodes.values() if node_info.get('status', '') == 'healthy')
-            unhealthy_nodes = total_nodes - healthy_nodes
-            
-            total_cores = sum(node_info.get('cpu_cores', 0) for node_info in nodes.values())
-            available_cores = sum(node_info.get('available_cores', 0) for node_info in nodes.values())
-            used_cores = total_cores - available_cores
-            
-            # Calculate pod stats
-            total_pods = len(pods)
-            total_cpu_usage = sum(pod_info.get('cpu_requirement', 0) for pod_info in pods.values())
-            
-            # Count pods per node
-            pods_per_node = {}
-            for pod_info in pods.values():
-                node_id = pod_info.get('node_id')
-                if node_id:
-                    if node_id not in pods_per_node:
-                        pods_per_node[node_id] = 0
-                    pods_per_node[node_id] += 1
-            
-            return {
-                'nodes': {
-                    'total_nodes': total_nodes,
-                    'healthy_nodes': healthy_nodes,
-                    'unhealthy_nodes': unhealthy_nodes,
-                    'total_cores': total_cores,
-                    'available_cores': available_cores,
-                    'used_cores': used_cores
-                },
-                'pods': {
-                    'total_pods': total_pods,
-                    'total_cpu_usage': total_cpu_usage,
-                    'pods_per_node': pods_per_node
-                }
-            }
+        return get_dashboard(api_url, version, refresh_window())
+    except APIError as e:
+        st.error(str(e))
     except Exception as e:
         st.error(f"Error connecting to API server: {str(e)}")
-        return {'nodes': {}, 'pods': {}}
+    return None
 
 def add_node(cpu_cores):
     try:
-        response = requests.post(
+        response = get_session().post(
             f"{st.session_state.api_url}/nodes",
-            json={'cpu_cores': cpu_cores}
+            json={'cpu_cores': cpu_cores},
+            timeout=API_TIMEOUT
         )
-        if response.status_code == 201:
-            data = response.json()
+        if response.status_code in (201, 202):
+            data = _loads(response.content)
             node_id = data.get('node_id', '')
-            st.success(f"Node added successfully! Node ID: {node_id}")
+            if response.status_code == 202:
+                st.success(f"Node launch accepted! Node ID: {node_id} (pending)")
+            else:
+                st.success(f"Node added successfully! Node ID: {node_id}")
+            # Show the new node immediately instead of a cached view; the chart and table
+            # builders stay memoized, they are keyed on the data itself
+            get_dashboard.clear()
             return True
         else:
             st.error(f"Failed to add node: {response.text}")
@@ -187,17 +240,19 @@ def add_node(cpu_cores):
 
 def create_pod(cpu_requirement, algorithm):
     try:
-        response = requests.post(
+        response = get_session().post(
             f"{st.session_state.api_url}/pods",
             json={
                 'cpu_requirement': cpu_requirement,
                 'algorithm': algorithm
-            }
+            },
+            timeout=API_TIMEOUT
         )
         if response.status_code == 201:
-            data = response.json()
+            data = _loads(response.content)
             pod_id = data.get('pod_id', '')
             st.success(f"Pod created successfully! Pod ID: {pod_id}")
+            get_dashboard.clear()
             return True
         else:
             st.error(f"Failed to create pod: {response.text}")
@@ -206,33 +261,199 @@ def create_pod(cpu_requirement, algorithm):
         st.error(f"Error connecting to API server: {str(e)}")
         return False
 
-def auto_refresh():
-    try:
-        while st.session_state.get('refresh_active', False):
-            # Update the dashboard data
-            try:
-                time.sleep(st.session_state.get('refresh_interval', 5))
-                st.session_state.last_update = datetime.now()
-                st.experimental_rerun()
-            except Exception as e:
-                # Handle any errors that might occur during refresh
-                pass
-    except Exception as e:
-        # If there's an error accessing session state, just exit the thread
-        pass
+def stat_card(col, value, label):
+    """Render an overview card as a single markdown element"""
+    col.markdown(f"<div class='stat-card'><div class='stat-value'>{value}</div>"
+                 f"<div class='stat-label'>{label}</div></div>", unsafe_allow_html=True)
+
+def short_ids(ids):
+    """Truncate a Series of IDs longer than 10 characters for display"""
+    return ids.where(ids.str.len() <= 10, ids.str.slice(0, 8) + '...')
+
+def color_status(status):
+    """Get the cell style for a node status in the Nodes and Pods tables"""
+    return 'background-color: #C8E6C9' if status == 'healthy' else 'background-color: #FFCDD2'
+
+# Table frames, memoized on the API payload so an unchanged cluster skips rebuilding them;
+# the Styler wrapping them is lazy and can't be pickled, so it is applied per run
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_node_df(nodes):
+    """Build the Nodes table"""
+    # One row per node keyed by its ID
+    raw = pd.DataFrame.from_dict(nodes, orient='index').reindex(
+        columns=['cpu_cores', 'available_cores', 'status', 'pods'])
+    node_ids = raw.index.to_series()
+    return pd.DataFrame({
+        'Node ID': short_ids(node_ids),
+        'Full ID': node_ids,
+        'CPU Cores': raw['cpu_cores'].fillna(0).astype(int),
+        'Available Cores': raw['available_cores'].fillna(0).astype(int),
+        'Status': raw['status'].fillna('unknown'),
+        'Pod Count': raw['pods'].str.len().fillna(0).astype(int)
+    }).reset_index(drop=True)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_pod_df(pods, nodes):
+    """Build the Pods table"""
+    # Every pod's node status is looked up in one reindex
+    raw = pd.DataFrame.from_dict(pods, orient='index').reindex(
+        columns=['cpu_requirement', 'node_id'])
+    pod_ids = raw.index.to_series()
+    node_ids = raw['node_id'].fillna('')
+    node_status = pd.Series({node_id: node_info.get('status', 'unknown')
+                             for node_id, node_info in nodes.items()}, dtype=object)
+    return pd.DataFrame({
+        'Pod ID': short_ids(pod_ids),
+        'Full ID': pod_ids,
+        'CPU Requirement': raw['cpu_requirement'].fillna(0).astype(int),
+        'Node ID': short_ids(node_ids),
+        'Node Status': node_status.reindex(node_ids).fillna('unknown').set_axis(node_ids.index)
+                                  .where(node_ids != '', 'unscheduled')
+    }).reset_index(drop=True)
+
+# Chart builders, memoized on their (hashable) numeric inputs so unchanged charts are not rebuilt
+@st.cache_data(show_spinner=False)
+def build_health_pie(healthy_nodes, unhealthy_nodes):
+    fig = go.Figure(data=[go.Pie(
+        labels=['Healthy', 'Unhealthy'],
+        values=[healthy_nodes, unhealthy_nodes],
+        hole=.3,
+        marker_colors=['#4CAF50', '#F44336']
+    )])
+    fig.update_layout(title_text="Node Health Distribution")
+    return fig
 
-def toggle_auto_refresh():
-    st.session_state.auto_refresh = not st.session_state.auto_refresh
+@st.cache_data(show_spinner=False)
+def build_cpu_bar(used_cores, available_cores):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=['CPU Cores'],
+        y=[used_cores],
+        name='Used',
+        marker_color='#FF9800'
+    ))
+    fig.add_trace(go.Bar(
+        x=['CPU Cores'],
+        y=[available_cores],
+        name='Available',
+        marker_color='#2196F3'
+    ))
+    fig.update_layout(
+        barmode='stack',
+        title_text="CPU Resource Allocation",
+        xaxis=dict(title=''),
+        yaxis=dict(title='Cores')
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_pods_per_node_bar(pod_counts):
+    # pod_counts is a tuple of (node label, pod count) pairs
+    labels, counts = zip(*pod_counts) if pod_counts else ((), ())
+    fig = go.Figure(go.Bar(x=list(labels), y=list(counts)))
+    fig.update_layout(title="Pods per Node", xaxis_title="Node ID", yaxis_title="Number of Pods")
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_per_node_bars(node_cores):
+    # node_cores is a tuple of (node label, used cores, available cores) triples
+    node_labels, used, available = zip(*node_cores)
     
-    if st.session_state.auto_refresh:
-        st.session_state.refresh_active = True
-        refresh_thread = threading.Thread(target=auto_refresh)
-        refresh_thread.daemon = True
-        refresh_thread.start()
-        st.session_state.refresh_thread = refresh_thread
-    else:
-        st.session_state.refresh_active = False
-        # Let the thread terminate on its own by checking the refresh_active flag
+    # One trace per series rather than two per node, so render cost doesn't grow with the cluster
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=node_labels,
+        y=used,
+        name='Used',
+        marker_color='#FF9800'
+    ))
+    fig.add_trace(go.Bar(
+        x=node_labels,
+        y=available,
+        name='Available',
+        marker_color='#2196F3'
+    ))
+    
+    fig.update_layout(
+        barmode='stack',
+        title='CPU Resource Allocation per Node',
+        xaxis=dict(title='Node ID'),
+        yaxis=dict(title='CPU Cores')
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_util_heatmap(node_labels, utilizations):
+    fig = go.Figure(data=go.Heatmap(
+        z=[list(utilizations)],
+        x=list(node_labels),
+        y=['Utilization'],
+        colorscale='RdYlGn_r',
+        showscale=True
+    ))
+    
+    fig.update_layout(
+        title='CPU Utilization Heat Map',
+        xaxis=dict(title='Node ID'),
+        yaxis=dict(title='')
+    )
+    return fig
+
+# A listener whose API server no dashboard has asked about for this long stops
+LISTENER_IDLE_TIMEOUT = 60
+# The longest wait between reconnect attempts while the event stream is unavailable
+LISTENER_MAX_BACKOFF = 60
+
+def listen_for_events(api_url, events):
+    """Track the cluster version pushed over the API server's /ws/events WebSocket"""
+    ws_url = 'ws' + api_url[len('http'):] + '/ws/events'
+    failures = 0
+    while True:
+        with events['lock']:
+            # Stop once the URL is no longer in use; watch_events starts a new listener if it is again
+            if time.monotonic() - events['last_used'] > LISTENER_IDLE_TIMEOUT:
+                events['listening'] = False
+                events['connected'] = False
+                return
+        try:
+            with ws_connect(ws_url, open_timeout=WS_OPEN_TIMEOUT) as ws:
+                events['connected'] = True
+                failures = 0
+                while time.monotonic() - events['last_used'] <= LISTENER_IDLE_TIMEOUT:
+                    try:
+                        events['version'] = _loads(ws.recv(timeout=LISTENER_IDLE_TIMEOUT))['version']
+                    except TimeoutError:
+                        pass
+        except Exception as e:
+            # Warn once per outage; a server without /ws/events would otherwise log every few seconds
+            if not failures:
+                logger.warning(f"Event stream from {ws_url} unavailable, polling instead: {str(e)}")
+            else:
+                logger.debug(f"Event stream from {ws_url} still unavailable: {str(e)}")
+            failures += 1
+        # Fall back to plain polling until the server can be reached again, backing off while it can't
+        events['connected'] = False
+        time.sleep(min(LISTENER_MAX_BACKOFF, 5 * (1 << min(max(failures - 1, 0), 4))))
+
+# One listener thread and WebSocket per API server for the whole process, shared by every
+# browser session, so page loads don't each leave a thread and a server connection behind
+@st.cache_resource(show_spinner=False)
+def get_event_listener(api_url):
+    """Get the shared event state of an API server; watch_events keeps its listener running"""
+    return {'version': None, 'connected': False, 'listening': False,
+            'last_used': time.monotonic(), 'lock': threading.Lock()}
+
+def watch_events(api_url):
+    """Get the latest cluster version pushed by an API server, (re)starting its listener as needed"""
+    events = get_event_listener(api_url)
+    with events['lock']:
+        events['last_used'] = time.monotonic()
+        if not events['listening']:
+            events['listening'] = True
+            listener = threading.Thread(target=listen_for_events, args=(api_url, events))
+            listener.daemon = True
+            listener.start()
+    return events
 
 # Sidebar for settings and actions
 with st.sidebar:
@@ -245,8 +466,7 @@ with st.sidebar:
         st.session_state.api_url = api_url
     
     # Auto-refresh toggle
-    st.checkbox("Auto-refresh dashboard", value=st.session_state.auto_refresh, 
-                on_change=toggle_auto_refresh)
+    st.checkbox("Auto-refresh dashboard", key="auto_refresh")
     
     if st.session_state.auto_refresh:
         st.session_state.refresh_interval = st.slider(
@@ -274,277 +494,178 @@ with st.sidebar:
         create_pod(int(cpu_requirement), algorithm)
     
     st.markdown("---")
-    st.markdown(f"Last update: {st.session_state.last_update.strftime('%H:%M:%S')}")
     if not st.session_state.auto_refresh:
         if st.button("Refresh Dashboard"):
-            st.session_state.last_update = datetime.now()
-            st.experimental_rerun()
+            st.rerun()
 
 # Main content
 st.markdown("<h1 class='main-header'>Kubernetes Cluster Simulation Dashboard</h1>", unsafe_allow_html=True)
 
-# Get current data
-nodes = get_nodes()
-pods = get_pods()
-stats = get_stats()
-
-# Overview Stats in cards
-st.markdown("## 📊 Cluster Overview")
-col1, col2, col3, col4 = st.columns(4)
+# A change of tab visibility re-runs the whole script, re-arming or pausing the refresh timer
+page_hidden = page_visibility(key="page_hidden", default=False)
 
-with col1:
-    st.markdown("<div class='stat-card'>", unsafe_allow_html=True)
-    st.markdown(f"<div class='stat-value'>{stats.get('nodes', {}).get('total_nodes', 0)}</div>", unsafe_allow_html=True)
-    st.markdown("<div class='stat-label'>Total Nodes</div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+# Only the dashboard re-runs on the refresh interval; the sidebar and forms stay mounted
+@st.fragment(run_every=st.session_state.refresh_interval
+             if st.session_state.auto_refresh and not page_hidden else None)
+def dashboard():
+    # Skip a refresh already scheduled before the tab was hidden
+    if st.session_state.get('page_hidden'):
+        return
+    # Get current data, remembering which pushed version it reflects
+    events = watch_events(st.session_state.api_url)
+    version = events['version']
+    # With a live event stream, a timed refresh redraws the last data until the cluster has
+    # actually changed; every run must redraw, as the fragment drops whatever it doesn't draw
+    if (events['connected'] and version is not None and version == st.session_state.rendered_version
+            and st.session_state.dashboard_data is not None):
+        nodes, pods, stats = st.session_state.dashboard_data
+    else:
+        data = load_dashboard(st.session_state.api_url, version)
+        if data is not None:
+            st.session_state.last_update = datetime.now()
+            st.session_state.dashboard_data = data
+            st.session_state.rendered_version = version
+        nodes, pods, stats = data or ({}, {}, {'nodes': {}, 'pods': {}})
+    st.caption(f"Last update: {st.session_state.last_update.strftime('%H:%M:%S')}")
+    node_stats = stats.get('nodes') or {}
+    pod_stats = stats.get('pods') or {}
+    total_nodes = node_stats.get('total_nodes', 0)
+    healthy_nodes = node_stats.get('healthy_nodes', 0)
+    unhealthy_nodes = node_stats.get('unhealthy_nodes', 0)
+    total_cores = node_stats.get('total_cores', 0)
+    used_cores = node_stats.get('used_cores', 0)
+    available_cores = node_stats.get('available_cores', 0)
 
-with col2:
-    st.markdown("<div class='stat-card'>", unsafe_allow_html=True)
-    st.markdown(f"<div class='stat-value'>{stats.get('pods', {}).get('total_pods', 0)}</div>", unsafe_allow_html=True)
-    st.markdown("<div class='stat-label'>Total Pods</div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    # Overview Stats in cards
+    st.markdown("## 📊 Cluster Overview")
+    col1, col2, col3, col4 = st.columns(4)
 
-with col3:
     health_percentage = 0
-    if stats.get('nodes', {}).get('total_nodes', 0) > 0:
-        health_percentage = (stats.get('nodes', {}).get('healthy_nodes', 0) / stats.get('nodes', {}).get('total_nodes', 1)) * 100
-    
-    st.markdown("<div class='stat-card'>", unsafe_allow_html=True)
-    st.markdown(f"<div class='stat-value'>{health_percentage:.1f}%</div>", unsafe_allow_html=True)
-    st.markdown("<div class='stat-label'>Cluster Health</div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with col4:
+    if total_nodes > 0:
+        health_percentage = (healthy_nodes / total_nodes) * 100
     utilization = 0
-    if stats.get('nodes', {}).get('total_cores', 0) > 0:
-        utilization = (stats.get('nodes', {}).get('used_cores', 0) / stats.get('nodes', {}).get('total_cores', 1)) * 100
-    
-    st.markdown("<div class='stat-card'>", unsafe_allow_html=True)
-    st.markdown(f"<div class='stat-value'>{utilization:.1f}%</div>", unsafe_allow_html=True)
-    st.markdown("<div class='stat-label'>CPU Utilization</div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-# Health and Resource Visualization
-st.markdown("## 🔍 Health & Resources")
-col1, col2 = st.columns(2)
-
-with col1:
-    # Node Health Pie Chart
-    healthy_nodes = stats.get('nodes', {}).get('healthy_nodes', 0)
-    unhealthy_nodes = stats.get('nodes', {}).get('unhealthy_nodes', 0)
-    
-    if healthy_nodes > 0 or unhealthy_nodes > 0:
-        fig = go.Figure(data=[go.Pie(
-            labels=['Healthy', 'Unhealthy'],
-            values=[healthy_nodes, unhealthy_nodes],
-            hole=.3,
-            marker_colors=['#4CAF50', '#F44336']
-        )])
-        fig.update_layout(title_text="Node Health Distribution")
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("No nodes available for health visualization")
-
-with col2:
-    # CPU Resource Usage Bar Chart
-    total_cores = stats.get('nodes', {}).get('total_cores', 0)
-    used_cores = stats.get('nodes', {}).get('used_cores', 0)
-    available_cores = stats.get('nodes', {}).get('available_cores', 0)
-    
     if total_cores > 0:
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=['CPU Cores'],
-            y=[used_cores],
-            name='Used',
-            marker_color='#FF9800'
-        ))
-        fig.add_trace(go.Bar(
-            x=['CPU Cores'],
-            y=[available_cores],
-            name='Available',
-            marker_color='#2196F3'
-        ))
-        fig.update_layout(
-            barmode='stack',
-            title_text="CPU Resource Allocation",
-            xaxis=dict(title=''),
-            yaxis=dict(title='Cores')
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("No CPU resource data available")
+        utilization = (used_cores / total_cores) * 100
 
-# Nodes and Pods Tabs
-st.markdown("## 📋 Cluster Resources")
-tab1, tab2 = st.tabs(["Nodes", "Pods"])
+    stat_card(col1, total_nodes, "Total Nodes")
+    stat_card(col2, pod_stats.get('total_pods', 0), "Total Pods")
+    stat_card(col3, f"{health_percentage:.1f}%", "Cluster Health")
+    stat_card(col4, f"{utilization:.1f}%", "CPU Utilization")
 
-with tab1:
-    if nodes:
-        # Create a dataframe for nodes
-        node_data = []
-        for node_id, node_info in nodes.items():
-            # Handle potential missing keys with .get()
-            node_data.append({
-                'Node ID': node_id[:8] + '...' if len(node_id) > 10 else node_id,
-                'Full ID': node_id,
-                'CPU Cores': node_info.get('cpu_cores', 0),
-                'Available Cores': node_info.get('available_cores', 0),
-                'Status': node_info.get('status', 'unknown'),
-                'Pod Count': len(node_info.get('pods', []))
-            })
-        
-        node_df = pd.DataFrame(node_data)
-        
-        # Apply conditional formatting
-        def highlight_status(s):
-            return ['background-color: #C8E6C9' if s == 'healthy' else 'background-color: #FFCDD2' for s in s]
+    # Health and Resource Visualization
+    st.markdown("## 🔍 Health & Resources")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Node Health Pie Chart
+        if healthy_nodes > 0 or unhealthy_nodes > 0:
+            st.plotly_chart(build_health_pie(healthy_nodes, unhealthy_nodes), use_container_width=True)
+        else:
+            st.info("No nodes available for health visualization")
+
+    with col2:
+        # CPU Resource Usage Bar Chart
+        if total_cores > 0:
+            st.plotly_chart(build_cpu_bar(used_cores, available_cores), use_container_width=True)
+        else:
+            st.info("No CPU resource data available")
+
+    # Nodes and Pods Tabs
+    st.markdown("## 📋 Cluster Resources")
+    tab1, tab2 = st.tabs(["Nodes", "Pods"])
+
+    with tab1:
+        if nodes:
+            node_df = build_node_df(nodes)
         
-        # Apply the formatting and display
-        if not node_df.empty:
-            st.dataframe(
-                node_df.style.apply(lambda x: highlight_status(x) if x.name == 'Status' else [''] * len(x), axis=0),
-                use_container_width=True
-            )
+            # Apply the formatting and display
+            if not node_df.empty:
+                st.dataframe(
+                    node_df.style.map(color_status, subset=['Status']),
+                    use_container_width=True
+                )
             
-            # Node details expander
-            with st.expander("Node Details"):
-                for node_id, node_info in nodes.items():
-                    status = node_info.get('status', 'unknown')
-                    status_class = "node-healthy" if status == 'healthy' else "node-unhealthy"
-                    st.markdown(f"#### Node: {node_id}")
-                    st.markdown(f"- Status: <span class='{status_class}'>{status}</span>", unsafe_allow_html=True)
-                    st.markdown(f"- CPU Cores: {node_info.get('cpu_cores', 0)}")
-                    st.markdown(f"- Available Cores: {node_info.get('available_cores', 0)}")
-                    st.markdown(f"- Used Cores: {node_info.get('cpu_cores', 0) - node_info.get('available_cores', 0)}")
-                    st.markdown(f"- Pods: {', '.join(node_info.get('pods', [])) if node_info.get('pods', []) else 'None'}")
-                    st.markdown("---")
+                # Node details expander
+                with st.expander("Node Details"):
+                    for node_id, node_info in nodes.items():
+                        status = node_info.get('status', 'unknown')
+                        status_class = "node-healthy" if status == 'healthy' else "node-unhealthy"
+                        st.markdown(f"#### Node: {node_id}")
+                        st.markdown(f"- Status: <span class='{status_class}'>{status}</span>", unsafe_allow_html=True)
+                        st.markdown(f"- CPU Cores: {node_info.get('cpu_cores', 0)}")
+                        st.markdown(f"- Available Cores: {node_info.get('available_cores', 0)}")
+                        st.markdown(f"- Used Cores: {node_info.get('cpu_cores', 0) - node_info.get('available_cores', 0)}")
+                        st.markdown(f"- Pods: {', '.join(node_info.get('pods', [])) if node_info.get('pods', []) else 'None'}")
+                        st.markdown("---")
+            else:
+                st.info("No nodes found in the cluster")
         else:
             st.info("No nodes found in the cluster")
-    else:
-        st.info("No nodes found in the cluster")
-
-with tab2:
-    if pods:
-        # Create a dataframe for pods
-        pod_data = []
-        for pod_id, pod_info in pods.items():
-            node_id = pod_info.get('node_id', '')
-            pod_data.append({
-                'Pod ID': pod_id[:8] + '...' if len(pod_id) > 10 else pod_id,
-                'Full ID': pod_id,
-                'CPU Requirement': pod_info.get('cpu_requirement', 0),
-                'Node ID': node_id[:8] + '...' if node_id and len(node_id) > 10 else node_id,
-                'Node Status': nodes.get(node_id, {}).get('status', 'unknown') if node_id else 'unscheduled'
-            })
-        
-        pod_df = pd.DataFrame(pod_data)
-        
-        # Apply conditional formatting for node status
-        def highlight_node_status(s):
-            return ['background-color: #C8E6C9' if s == 'healthy' else 'background-color: #FFCDD2' for s in s]
+
+    with tab2:
+        if pods:
+            pod_df = build_pod_df(pods, nodes)
         
-        # Apply the formatting and display
-        if not pod_df.empty:
-            st.dataframe(
-                pod_df.style.apply(lambda x: highlight_node_status(x) if x.name == 'Node Status' else [''] * len(x), axis=0),
-                use_container_width=True
-            )
+            # Apply the formatting and display
+            if not pod_df.empty:
+                st.dataframe(
+                    pod_df.style.map(color_status, subset=['Node Status']),
+                    use_container_width=True
+                )
             
-            # Pod allocation visualization
-            if nodes:
-                pod_per_node = {}
-                for node_id, node_info in nodes.items():
-                    pod_per_node[node_id[:8] + '...'] = len(node_info.get('pods', []))
-                
-                if pod_per_node:
-                    fig = px.bar(
-                        x=list(pod_per_node.keys()),
-                        y=list(pod_per_node.values()),
-                        labels={'x': 'Node ID', 'y': 'Number of Pods'},
-                        title="Pods per Node"
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                # Pod allocation visualization, reusing the pod counts of the Nodes table
+                if nodes:
+                    pod_per_node = tuple(zip(node_df['Full ID'].str.slice(0, 8) + '...',
+                                             node_df['Pod Count'].tolist()))
+                    st.plotly_chart(build_pods_per_node_bar(pod_per_node), use_container_width=True)
+            else:
+                st.info("No pods found in the cluster")
         else:
             st.info("No pods found in the cluster")
-    else:
-        st.info("No pods found in the cluster")
-
-# Resource allocation visualization
-st.markdown("## 📈 Resource Allocation")
-
-if nodes:
-    # Create data for node resource visualization
-    node_resources = []
-    for node_id, node_info in nodes.items():
-        cpu_cores = node_info.get('cpu_cores', 0)
-        available_cores = node_info.get('available_cores', 0)
-        used_cores = cpu_cores - available_cores
-        utilization = (used_cores / cpu_cores) * 100 if cpu_cores > 0 else 0
+
+    # Resource allocation visualization
+    st.markdown("## 📈 Resource Allocation")
+
+    if nodes:
+        # Create data for node resource visualization
+        node_resources = []
+        for node_id, node_info in nodes.items():
+            cpu_cores = node_info.get('cpu_cores', 0)
+            available_cores = node_info.get('available_cores', 0)
+            used_cores = cpu_cores - available_cores
+            utilization = (used_cores / cpu_cores) * 100 if cpu_cores > 0 else 0
         
-        node_resources.append({
-            'Node ID': node_id[:8] + '...',
-            'Total Cores': cpu_cores,
-            'Used Cores': used_cores,
-            'Available Cores': available_cores,
-            'Utilization (%)': utilization
-        })
+            node_resources.append({
+                'Node ID': node_id[:8] + '...',
+                'Total Cores': cpu_cores,
+                'Used Cores': used_cores,
+                'Available Cores': available_cores,
+                'Utilization (%)': utilization
+            })
     
-    node_resource_df = pd.DataFrame(node_resources)
+        node_resource_df = pd.DataFrame(node_resources)
     
-    if not node_resource_df.empty:
-        # Bar chart for core allocation per node
-        fig = go.Figure()
-        
-        for i, node in enumerate(node_resource_df['Node ID']):
-            fig.add_trace(go.Bar(
-                x=[node],
-                y=[node_resource_df.loc[i, 'Used Cores']],
-                name='Used',
-                marker_color='#FF9800',
-                showlegend=i==0
-            ))
-            fig.add_trace(go.Bar(
-                x=[node],
-                y=[node_resource_df.loc[i, 'Available Cores']],
-                name='Available',
-                marker_color='#2196F3',
-                showlegend=i==0
-            ))
-        
-        fig.update_layout(
-            barmode='stack',
-            title='CPU Resource Allocation per Node',
-            xaxis=dict(title='Node ID'),
-            yaxis=dict(title='CPU Cores')
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Heat map for node utilization
-        fig = go.Figure(data=go.Heatmap(
-            z=[node_resource_df['Utilization (%)']],
-            x=node_resource_df['Node ID'],
-            y=['Utilization'],
-            colorscale='RdYlGn_r',
-            showscale=True
-        ))
+        # Nodes with no cores (e.g. still starting up) have nothing to plot
+        if not node_resource_df.empty and node_resource_df['Total Cores'].sum() > 0:
+            # Bar chart for core allocation per node
+            node_cores = tuple(zip(node_resource_df['Node ID'],
+                                   node_resource_df['Used Cores'].tolist(),
+                                   node_resource_df['Available Cores'].tolist()))
+            st.plotly_chart(build_per_node_bars(node_cores), use_container_width=True)
         
-        fig.update_layout(
-            title='CPU Utilization Heat Map',
-            xaxis=dict(title='Node ID'),
-            yaxis=dict(title='')
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+            # Heat map for node utilization
+            st.plotly_chart(build_util_heatmap(tuple(node_resource_df['Node ID']),
+                                               tuple(node_resource_df['Utilization (%)'].tolist())),
+                            use_container_width=True)
+        else:
+            st.info("No node resource data available")
     else:
-        st.info("No node resource data available")
-else:
-    st.info("No nodes found in the cluster for resource allocation visualization")
+        st.info("No nodes found in the cluster for resource allocation visualization")
+
+# A full run, e.g. after adding a node or changing the API URL, always fetches fresh data
+st.session_state.rendered_version = None
+dashboard()
 
 # Footer
 st.markdown("---")
 st.markdown("<center>Kubernetes Cluster Simulation Dashboard | Created with Streamlit</center>", unsafe_allow_html=True)
-
-# Handle auto-refresh thread termination when the app is closed
-# This is handled by the daemon=True flag in the thread creation
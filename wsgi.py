@@ -0,0 +1,16 @@
+# Production entrypoint for the API server.
+#
+# gevent must patch the standard library before Flask, requests or docker-py
+# are imported, so that socket I/O (including docker-py's calls to dockerd
+# and the health monitor's sleeps) yields to other greenlets instead of
+# blocking the worker.
+#
+# Run with:
+#   gunicorn -k gevent -w 1 --worker-connections 1000 -b 0.0.0.0:5001 wsgi:app
+#
+# Cluster state lives in process memory, so keep a single worker (-w 1);
+# concurrency comes from the gevent worker connections.
+from gevent import monkey
+monkey.patch_all()
+
+from api_server import app  # noqa: E402